@@ -1,12 +1,141 @@
+from django.conf import settings
 from django.contrib import admin
-from vgg_food_vendor_project.food_vendor_app.models import Vendor, Customer, Auth, Menu, Order, OrderStatus, Notification, MessageStatus
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import transaction
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from vgg_food_vendor_project.food_vendor_app.deletion import scheduleAccountDeletion
+from vgg_food_vendor_project.food_vendor_app.ordercache import customerOrderCache
+from vgg_food_vendor_project.food_vendor_app.pricing import bumpMenuVersion
+from vgg_food_vendor_project.food_vendor_app.profiling import capturedProfiles, profilePath
+from vgg_food_vendor_project.food_vendor_app.models import Vendor, Customer, Auth, Menu, Order, OrderItem, OrderArchive, OrderStatus, Notification, MessageStatus, RevokedToken, AccountDeletion, MenuTombstone
+
+
+class AccountAdmin(admin.ModelAdmin):
+    """
+    Deleting a vendor or customer deactivates it and leaves its data to
+    `manage.py processaccountdeletions` instead of one cascading transaction.
+    """
+
+    userType = None
+
+    def get_deleted_objects(self, objs, request):
+        """
+        The delete confirmation lists the accounts only, without collecting the rows that
+        their deletion will remove later.
+        """
+
+        accounts = list(objs)
+        permissionsNeeded = set()
+        if not self.has_delete_permission(request):
+            permissionsNeeded.add(self.opts.verbose_name)
+        return [str(account) for account in accounts], {
+            self.opts.verbose_name_plural: len(accounts)}, permissionsNeeded, []
+
+    def delete_model(self, request, obj):
+        scheduleAccountDeletion(self.userType, obj.id)
+
+    def delete_queryset(self, request, queryset):
+        for profileId in queryset.values_list('id', flat=True):
+            scheduleAccountDeletion(self.userType, profileId)
+
+
+class VendorAdmin(AccountAdmin):
+    userType = 'vendor'
+
+
+class CustomerAdmin(AccountAdmin):
+    userType = 'customer'
+
+
+class MenuAdmin(admin.ModelAdmin):
+    """
+    Menu changes bump the vendor's menu version so cached order prices are reloaded.
+    """
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            bumpMenuVersion(obj.vendorId_id)
+            if change and 'vendorId' in form.initial and form.initial['vendorId'] != obj.vendorId_id:
+                bumpMenuVersion(form.initial['vendorId'])
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            bumpMenuVersion(obj.vendorId_id)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            vendorIds = set(queryset.values_list('vendorId', flat=True))
+            super().delete_queryset(request, queryset)
+            for vendorId in vendorIds:
+                bumpMenuVersion(vendorId)
+
+
+class OrderAdmin(admin.ModelAdmin):
+    """
+    Order changes drop the cached orders of their customers.
+    """
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            customerOrderCache.invalidate(obj.customerId_id)
+            if change and 'customerId' in form.initial and form.initial['customerId'] != obj.customerId_id:
+                customerOrderCache.invalidate(form.initial['customerId'])
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            customerOrderCache.invalidate(obj.customerId_id)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            customerIds = set(queryset.values_list('customerId', flat=True))
+            super().delete_queryset(request, queryset)
+            customerOrderCache.invalidate(*customerIds)
+
+
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = ['userType', 'profileId', 'stage', 'deletedRows', 'dateTimeCreated', 'dateTimeCompleted']
+    readonly_fields = ['userType', 'profileId', 'stage', 'deletedRows', 'dateTimeCompleted']
+
+
+@staff_member_required
+def profiles(request):
+    """
+    Admin page listing the slowest requests captured by ProfilingMiddleware.
+    """
+
+    context = dict(admin.site.each_context(request), title='Request profiles',
+                   profiles=capturedProfiles()[:settings.PROFILING_ADMIN_LIST_SIZE])
+    return render(request, 'admin/profiles.html', context)
+
+
+@staff_member_required
+def profileFile(request, route, name, extension):
+    """
+    Admin download of the `.pstats` or `.collapsed` file of a captured profile.
+    """
+
+    path = profilePath(route, name, extension)
+    if not path:
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename='{}-{}.{}'.format(route, name, extension))
+
 
 # Register your models here.
-admin.site.register(Vendor)
-admin.site.register(Customer)
+admin.site.register(Vendor, VendorAdmin)
+admin.site.register(Customer, CustomerAdmin)
 admin.site.register(Auth)
-admin.site.register(Menu)
-admin.site.register(Order)
+admin.site.register(Menu, MenuAdmin)
+admin.site.register(Order, OrderAdmin)
+admin.site.register(OrderItem)
+admin.site.register(OrderArchive)
 admin.site.register(OrderStatus)
 admin.site.register(Notification)
 admin.site.register(MessageStatus)
+admin.site.register(RevokedToken)
+admin.site.register(AccountDeletion, AccountDeletionAdmin)
+admin.site.register(MenuTombstone)
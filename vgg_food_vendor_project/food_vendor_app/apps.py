@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class FoodVendorAppConfig(AppConfig):
     name = 'vgg_food_vendor_project.food_vendor_app'
+
+    def ready(self):
+        from vgg_food_vendor_project.food_vendor_app.ordercache import checkOrderCacheBackend
+        checkOrderCacheBackend()
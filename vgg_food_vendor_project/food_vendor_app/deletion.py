@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from time import sleep
+from django.db import connections, router, transaction
+from django.db.models import Q
+from rest_framework_jwt.settings import api_settings
+from vgg_food_vendor_project.food_vendor_app.models import (
+    AccountDeletion,
+    Auth,
+    Customer,
+    Menu,
+    MenuTombstone,
+    Notification,
+    Order,
+    OrderArchive,
+    OrderItem,
+    Vendor
+)
+from vgg_food_vendor_project.food_vendor_app.ordercache import customerOrderCache
+from vgg_food_vendor_project.food_vendor_app.pricing import bumpMenuVersion
+from vgg_food_vendor_project.food_vendor_app.revocation import revocationList
+
+
+profileModels = {'vendor': Vendor, 'customer': Customer}
+
+# Field that ties orders and archived orders to the account being deleted
+ownerFields = {'vendor': 'vendorId', 'customer': 'customerId'}
+
+
+def accountTokenId(userType, profileId):
+    """
+    Function that gives the revocation id shared by every token of an account.
+    """
+
+    return '{}:{}'.format(userType, profileId)
+
+
+def stageRows(stage, userType, profileId):
+    """
+    Function that gives the rows deleted by a stage of an account deletion.
+    """
+
+    orders = Order.objects.filter(**{ownerFields[userType]: profileId})
+
+    if stage == 'notifications':
+        return Notification.objects.filter(Q(orderId__in=orders.values('id')) | Q(
+            subjectUser__userType=userType, subjectUser__profileId=profileId))
+    if stage == 'orderItems':
+        return OrderItem.objects.filter(orderId__in=orders.values('id'))
+    if stage == 'orders':
+        return orders
+    if stage == 'archivedOrders':
+        return OrderArchive.objects.filter(**{ownerFields[userType]: profileId})
+    if stage == 'menus':
+        return Menu.objects.filter(vendorId=profileId) if userType == 'vendor' else Menu.objects.none()
+    if stage == 'account':
+        return Auth.objects.filter(userType=userType, profileId=profileId)
+
+
+# Dependents go before the rows they point at, so no batch cascades into another table
+deletionStages = ['notifications', 'orderItems', 'orders', 'archivedOrders', 'menus', 'account', 'done']
+
+
+def scheduleAccountDeletion(userType, profileId):
+    """
+    Function that deactivates an account at once and queues the deletion of its data. The
+    account can no longer log in, and its existing tokens are revoked. A vendor is no longer
+    listed nor ordered from, and its menus are given tombstones so synced clients drop them.
+    """
+
+    with transaction.atomic():
+        deletion, created = AccountDeletion.objects.get_or_create(
+            userType=userType, profileId=profileId)
+        Auth.objects.filter(userType=userType, profileId=profileId).update(isActive=False)
+        if userType == 'vendor':
+            Vendor.objects.filter(id=profileId).update(isActive=False)
+            with connections[router.db_for_write(MenuTombstone)].cursor() as cursor:
+                # Stamped like the tombstones the menu delete trigger writes
+                cursor.execute(
+                    'INSERT INTO {} ("menuId", "vendorId", "changeSequence", "dateTimeDeleted") '
+                    'SELECT id, "vendorId_id", txid_current(), now() FROM {} WHERE "vendorId_id" = %s'.format(
+                        MenuTombstone._meta.db_table, Menu._meta.db_table), [profileId])
+
+    revocationList.revoke(accountTokenId(userType, profileId),
+                          datetime.now(timezone.utc) + api_settings.JWT_EXPIRATION_DELTA)
+    return deletion
+
+
+def runAccountDeletion(deletion, batchSize, pause=0, report=None):
+    """
+    Function that deletes the data of an account stage by stage in batches of at most
+    `batchSize` rows, each in its own transaction. The stage and row counts are saved with every
+    batch, so an interrupted deletion continues where it stopped.
+    """
+
+    while deletion.stage != 'done':
+        rows = stageRows(deletion.stage, deletion.userType, deletion.profileId)
+
+        with transaction.atomic():
+            ids = list(rows.order_by('id').values_list('id', flat=True)[:batchSize])
+            if ids:
+                if deletion.stage == 'orders':
+                    customerOrderCache.invalidate(*Order.objects.filter(id__in=ids).values_list('customerId', flat=True))
+                rows.model.objects.filter(id__in=ids).delete()
+                if deletion.stage == 'menus':
+                    bumpMenuVersion(deletion.profileId)
+                deletion.deletedRows[deletion.stage] = deletion.deletedRows.get(
+                    deletion.stage, 0) + len(ids)
+            else:
+                if deletion.stage == 'account':
+                    profileModels[deletion.userType].objects.filter(id=deletion.profileId).delete()
+                    deletion.dateTimeCompleted = datetime.now(timezone.utc)
+                deletion.stage = deletionStages[deletionStages.index(deletion.stage) + 1]
+            deletion.save()
+
+        if report:
+            report(deletion)
+        if ids:
+            sleep(pause)
+
+    return deletion
@@ -0,0 +1,36 @@
+from vgg_food_vendor_project.food_vendor_app.models import (
+    Customer,
+    Menu,
+    Order,
+    OrderStatus,
+    Vendor
+)
+
+
+class RollbackBenchmark(Exception):
+    """
+    Raised at the end of a benchmark to roll back the rows it seeded.
+    """
+    pass
+
+
+def seedBenchmarkRows(rows):
+    """
+    Function that seeds a vendor with `rows` menus and `rows` orders, and returns the vendor.
+    """
+
+    vendor = Vendor.objects.create(
+        businessName='Bench Vendor', email='bench.vendor@fva.org', phoneNumber='+2348000000001')
+    customer = Customer.objects.create(
+        firstname='Bench', lastname='Customer', email='bench.customer@fva.org', phoneNumber='+2348000000002')
+    orderStatus = OrderStatus.objects.get_or_create(name='bench')[0]
+
+    Menu.objects.bulk_create([Menu(name='bench menu {}'.format(i), description='A benchmark menu item',
+                                   price=1500.5 + i, quantity=i, unit='plate', vendorId=vendor,
+                                   isRecurring=True, frequencyOfReoccurrence=['monday', 'friday'])
+                              for i in range(rows)], batch_size=1000)
+    Order.objects.bulk_create([Order(customerId=customer, vendorId=vendor, description='Benchmark order',
+                                     itemsOrdered=[i, i + 1, i + 2], amountDue=3000.25, amountPaid=1000,
+                                     amountOutstanding=2000.25, orderStatusId=orderStatus)
+                               for i in range(rows)], batch_size=1000)
+    return vendor
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from datetime import timedelta
+from time import sleep
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from vgg_food_vendor_project.food_vendor_app.models import Order, OrderArchive, OrderItem
+from vgg_food_vendor_project.food_vendor_app.ordercache import customerOrderCache
+
+
+# Order fields copied as they are into OrderArchive
+ARCHIVED_FIELDS = ['id', 'customerId_id', 'vendorId_id', 'description', 'itemsOrdered', 'amountDue',
+                   'amountPaid', 'amountOutstanding', 'orderStatusId_id', 'dateAndTimeOfOrder', 'preOrderDateTime']
+
+
+class Command(BaseCommand):
+    help = 'Moves completed and fully paid orders older than the archive age from Order to OrderArchive in small id-ordered batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+                            help='Keep orders made in the last DAYS days')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.ORDER_ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=settings.ORDER_ARCHIVE_PAUSE_SECONDS,
+                            help='Seconds to wait between batches')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the orders to archive')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days and --batch-size must be positive')
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        archivable = Order.objects.filter(dateAndTimeOfOrder__lt=cutoff, amountOutstanding__lte=0,
+                                          orderStatusId__name=settings.ORDER_STATUS_COMPLETED)
+
+        if options['dry_run']:
+            self.stdout.write('{} orders made before {} would be archived'.format(
+                archivable.count(), cutoff.isoformat()))
+            return
+
+        archived = 0
+        lastId = 0
+
+        while True:
+            with transaction.atomic():
+                rows = list(archivable.filter(id__gt=lastId).order_by(
+                    'id').values(*ARCHIVED_FIELDS)[:options['batch_size']])
+                if not rows:
+                    break
+                lastId = rows[-1]['id']
+                orderIds = [row['id'] for row in rows]
+
+                orderItems = defaultdict(list)
+                for orderId, menuId, quantity, unitPrice in OrderItem.objects.filter(orderId__in=orderIds).values_list(
+                        'orderId', 'menuId', 'quantity', 'unitPrice'):
+                    orderItems[orderId].append(
+                        {'menuId': menuId, 'quantity': quantity, 'unitPrice': unitPrice})
+
+                # Orders left behind by an interrupted run are already in the archive
+                OrderArchive.objects.bulk_create(
+                    [OrderArchive(orderItems=orderItems[row['id']], **row) for row in rows], ignore_conflicts=True)
+
+                # The orders and their lines are moved without the collector. Notifications keep
+                # the order id, which the archive keeps too, until purgenotifications gets them
+                orderItemRows = OrderItem.objects.filter(orderId__in=orderIds)
+                orderItemRows._raw_delete(orderItemRows.db)
+                orderRows = Order.objects.filter(id__in=orderIds)
+                orderRows._raw_delete(orderRows.db)
+                customerOrderCache.invalidate(*[row['customerId_id'] for row in rows])
+
+            archived += len(rows)
+            self.stdout.write('Archived {} orders up to id {}'.format(archived, lastId))
+
+            sleep(options['pause'])
+
+        if archived == 0:
+            self.stdout.write('No orders to archive made before {}'.format(cutoff.isoformat()))
+            return
+
+        self.stdout.write('Archived {} orders made before {}'.format(archived, cutoff.isoformat()))
@@ -0,0 +1,74 @@
+import json
+from io import BytesIO
+from timeit import default_timer as timer
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from vgg_food_vendor_project.food_vendor_app.management.benchmarks import (
+    RollbackBenchmark,
+    seedBenchmarkRows
+)
+from vgg_food_vendor_project.food_vendor_app.models import Menu, Order
+from vgg_food_vendor_project.food_vendor_app.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONRenderer
+)
+from vgg_food_vendor_project.food_vendor_app.serializers import menuValues, orderValues
+
+
+class Command(BaseCommand):
+    help = 'Compares encode time and payload size of the JSON, orjson and MessagePack renderers on seeded menu and order lists. All seeded rows are rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def timeRender(self, renderer, data, repeat):
+        """
+        Function that returns the best time and the rendered bytes of a renderer.
+        """
+
+        best = None
+        for _ in range(repeat):
+            start = timer()
+            content = renderer.render(data)
+            elapsed = timer() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+        renderers = [('json', JSONRenderer()), ('orjson', ORJSONRenderer()),
+                     ('msgpack', MessagePackRenderer())]
+
+        try:
+            with transaction.atomic():
+                vendor = seedBenchmarkRows(rows)
+                payloads = [
+                    ('menu', menuValues.many(Menu.objects.filter(vendorId=vendor))),
+                    ('order', orderValues.many(Order.objects.filter(vendorId=vendor))),
+                ]
+
+                for name, data in payloads:
+                    results = {}
+                    for rendererName, renderer in renderers:
+                        results[rendererName] = self.timeRender(renderer, data, repeat)
+
+                    if results['json'][1] != results['orjson'][1]:
+                        raise CommandError(
+                            'orjson output differs from JSONRenderer for {}'.format(name))
+                    unpacked = MessagePackParser().parse(
+                        BytesIO(results['msgpack'][1]))
+                    if unpacked != json.loads(results['json'][1]):
+                        raise CommandError(
+                            'MessagePack output does not decode to the JSON payload for {}'.format(name))
+
+                    jsonTime = results['json'][0]
+                    for rendererName, (elapsed, content) in results.items():
+                        self.stdout.write('{} {}: {} rows, {:.4f}s ({:.1f}x), {} bytes'.format(
+                            name, rendererName, rows, elapsed, jsonTime / elapsed, len(content)))
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            pass
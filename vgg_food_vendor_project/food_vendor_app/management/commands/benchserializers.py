@@ -0,0 +1,65 @@
+from timeit import default_timer as timer
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from vgg_food_vendor_project.food_vendor_app.management.benchmarks import (
+    RollbackBenchmark,
+    seedBenchmarkRows
+)
+from vgg_food_vendor_project.food_vendor_app.models import Menu, Order
+from vgg_food_vendor_project.food_vendor_app.serializers import (
+    MenuSerializer,
+    OrderSerializer,
+    menuValues,
+    orderValues
+)
+
+
+class Command(BaseCommand):
+    help = 'Compares model serializers with the values() read fast path on seeded rows. All seeded rows are rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def timeRender(self, serialize, repeat):
+        """
+        Function that returns the best time and the rendered bytes of a serializer run.
+        """
+
+        renderer = JSONRenderer()
+        best = None
+        for _ in range(repeat):
+            start = timer()
+            content = renderer.render(serialize())
+            elapsed = timer() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+
+        try:
+            with transaction.atomic():
+                vendor = seedBenchmarkRows(rows)
+                benchmarks = [
+                    ('menu', Menu.objects.filter(vendorId=vendor), MenuSerializer, menuValues),
+                    ('order', Order.objects.filter(vendorId=vendor), OrderSerializer, orderValues),
+                ]
+
+                for name, queryset, modelSerializer, valuesSerializer in benchmarks:
+                    serializerTime, serializerContent = self.timeRender(
+                        lambda: modelSerializer(queryset.all(), many=True).data, repeat)
+                    valuesTime, valuesContent = self.timeRender(
+                        lambda: valuesSerializer.many(queryset.all()), repeat)
+
+                    if serializerContent != valuesContent:
+                        raise CommandError(
+                            'The {} fast path does not render identical JSON'.format(name))
+
+                    self.stdout.write('{}: {} rows, serializer {:.3f}s, values {:.3f}s, speedup {:.1f}x'.format(
+                        name, rows, serializerTime, valuesTime, serializerTime / valuesTime))
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            pass
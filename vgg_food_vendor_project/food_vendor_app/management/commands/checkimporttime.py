@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# What a gunicorn worker imports before it can serve its first request
+
+bootScript = '''
+import django
+django.setup()
+import vgg_food_vendor_project.wsgi
+import {}
+'''.format(settings.ROOT_URLCONF)
+
+
+class Command(BaseCommand):
+    help = 'Measures worker boot import time with python -X importtime and fails when it exceeds the budget or when a lazily loaded module is imported at boot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=settings.IMPORT_TIME_BUDGET_MS)
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--top', type=int, default=10)
+
+    def measure(self):
+        """
+        Function that runs the boot script once and returns the total import time in microseconds
+        and the cumulative time of every imported module.
+        """
+
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'vgg_food_vendor_project.settings')}
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', bootScript],
+                                env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                universal_newlines=True)
+        if result.returncode != 0:
+            raise CommandError('Boot script failed:\n{}'.format(result.stderr))
+
+        total = 0
+        modules = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            selfTime, cumulative, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = int(cumulative)
+            # Only top level imports count towards the total, nested ones are in their cumulative time
+            if not name.startswith('  '):
+                total += int(cumulative)
+        return total, modules
+
+    def handle(self, *args, **options):
+        runs = [self.measure() for _ in range(options['runs'])]
+        total, modules = min(runs, key=lambda run: run[0])
+
+        self.stdout.write('Boot import time: {:.1f}ms (budget {:.1f}ms, best of {})'.format(
+            total / 1000, options['budget_ms'], options['runs']))
+        for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write('  {:>8.1f}ms  {}'.format(cumulative / 1000, name))
+
+        errors = []
+        eagerModules = [name for name in settings.IMPORT_TIME_LAZY_MODULES if name in modules]
+        if eagerModules:
+            errors.append('Lazily loaded modules imported at boot: {}'.format(
+                ', '.join(eagerModules)))
+        if total / 1000 > options['budget_ms']:
+            errors.append('Boot import time {:.1f}ms exceeds the {:.1f}ms budget'.format(
+                total / 1000, options['budget_ms']))
+        if errors:
+            raise CommandError('\n'.join(errors))
@@ -0,0 +1,133 @@
+import re
+from datetime import date, datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from vgg_food_vendor_project.food_vendor_app.models import Notification, Order, OrderItem
+
+
+ORDER_TABLE = Order._meta.db_table
+DEFAULT_PARTITION = ORDER_TABLE + '_default'
+PARTITION_NAME = re.compile(r'^{}_p(\d{{4}})_(\d{{2}})$'.format(ORDER_TABLE))
+
+
+def addMonths(month, months):
+    monthIndex = month.year * 12 + month.month - 1 + months
+    return date(monthIndex // 12, monthIndex % 12 + 1, 1)
+
+
+def partitionName(month):
+    return '{}_p{:%Y_%m}'.format(ORDER_TABLE, month)
+
+
+def partitionBounds(month):
+    return (datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+            datetime(*addMonths(month, 1).timetuple()[:3], tzinfo=timezone.utc))
+
+
+def attachedPartitions(cursor):
+    """Months of the order partitions currently attached, oldest first"""
+
+    cursor.execute(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE parent.relname = %s', [ORDER_TABLE])
+
+    months = []
+    for (name,) in cursor.fetchall():
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+class Command(BaseCommand):
+    help = 'Creates the monthly order partitions ahead of time and detaches or drops old ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=settings.ORDER_PARTITION_MONTHS_AHEAD,
+                            help='Make sure partitions exist up to AHEAD months after the current one')
+        parser.add_argument('--detach-before', metavar='YYYY-MM',
+                            help='Detach the partitions of the months before YYYY-MM')
+        parser.add_argument('--drop', action='store_true',
+                            help='Drop the detached partitions along with their notifications and order items')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only print the partitions that would change')
+
+    def handle(self, *args, **options):
+        if options['ahead'] < 0:
+            raise CommandError('--ahead must not be negative')
+        if options['drop'] and not options['detach_before']:
+            raise CommandError('--drop needs --detach-before')
+
+        detachBefore = None
+        if options['detach_before']:
+            try:
+                detachBefore = datetime.strptime(options['detach_before'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--detach-before must be formatted as YYYY-MM')
+
+        thisMonth = datetime.now(timezone.utc).date().replace(day=1)
+
+        with connection.cursor() as cursor:
+            existing = set(attachedPartitions(cursor))
+
+            for months in range(options['ahead'] + 1):
+                month = addMonths(thisMonth, months)
+                if month not in existing:
+                    self.createPartition(cursor, month, options['dry_run'])
+
+            if detachBefore:
+                if detachBefore > thisMonth:
+                    raise CommandError('Partitions of the current month cannot be detached')
+                for month in sorted(existing):
+                    if month < detachBefore:
+                        self.detachPartition(cursor, month, options['drop'], options['dry_run'])
+
+    def createPartition(self, cursor, month, dryRun):
+        """Creates the partition of a month, moving any of its orders out of the default partition"""
+
+        name = partitionName(month)
+        if dryRun:
+            self.stdout.write('Would create {}'.format(name))
+            return
+
+        start, end = partitionBounds(month)
+        with transaction.atomic():
+            cursor.execute('CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS)'.format(name, ORDER_TABLE))
+            cursor.execute(
+                'WITH moved AS (DELETE FROM {} WHERE "dateAndTimeOfOrder" >= %s AND "dateAndTimeOfOrder" < %s '
+                'RETURNING *) INSERT INTO {} SELECT * FROM moved'.format(DEFAULT_PARTITION, name), [start, end])
+            moved = cursor.rowcount
+            cursor.execute('ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)'.format(
+                ORDER_TABLE, name), [start, end])
+
+        self.stdout.write('Created {}{}'.format(
+            name, ' with {} orders from the default partition'.format(moved) if moved else ''))
+
+    def detachPartition(self, cursor, month, drop, dryRun):
+        name = partitionName(month)
+        if dryRun:
+            self.stdout.write('Would {} {}'.format('drop' if drop else 'detach', name))
+            return
+
+        with transaction.atomic():
+            cursor.execute('ALTER TABLE {} DETACH PARTITION {}'.format(ORDER_TABLE, name))
+            if not drop:
+                self.stdout.write('Detached {}'.format(name))
+                return
+
+            # The order foreign keys are not enforced by the database, so the rows
+            # pointing at the dropped orders go first
+            detachedOrders = 'SELECT id FROM {}'.format(name)
+            cursor.execute('DELETE FROM {} WHERE "orderId_id" IN ({})'.format(
+                Notification._meta.db_table, detachedOrders))
+            notifications = cursor.rowcount
+            cursor.execute('DELETE FROM {} WHERE "orderId_id" IN ({})'.format(
+                OrderItem._meta.db_table, detachedOrders))
+            orderItems = cursor.rowcount
+            cursor.execute('DROP TABLE {}'.format(name))
+
+        self.stdout.write('Dropped {} with {} notifications and {} order items'.format(
+            name, notifications, orderItems))
@@ -0,0 +1,59 @@
+from time import sleep
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from vgg_food_vendor_project.food_vendor_app.deletion import runAccountDeletion
+from vgg_food_vendor_project.food_vendor_app.models import AccountDeletion
+
+
+# First key of the advisory locks that keep two workers off the same deletion
+ADVISORY_LOCK_NAMESPACE = 3901
+
+
+class Command(BaseCommand):
+    help = 'Deletes the data of accounts scheduled for deletion in batches, resuming unfinished deletions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.ACCOUNT_DELETION_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=settings.ACCOUNT_DELETION_PAUSE_SECONDS,
+                            help='Seconds to wait between batches')
+        parser.add_argument('--poll', type=float, default=settings.ACCOUNT_DELETION_POLL_SECONDS,
+                            help='Seconds to wait for new deletions when there are none')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the pending deletions are done')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        while True:
+            for deletion in AccountDeletion.objects.filter(dateTimeCompleted__isnull=True).order_by('id'):
+                self.process(deletion, options)
+
+            if options['once']:
+                return
+            sleep(options['poll'])
+
+    def process(self, deletion, options):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(%s, %s)', [ADVISORY_LOCK_NAMESPACE, deletion.id])
+            if not cursor.fetchone()[0]:
+                return
+
+            try:
+                # Another worker may have moved it on before the lock was taken
+                deletion.refresh_from_db()
+                if deletion.dateTimeCompleted:
+                    return
+
+                self.stdout.write('Deleting {} {} from stage {}'.format(
+                    deletion.userType, deletion.profileId, deletion.stage))
+                runAccountDeletion(deletion, options['batch_size'], options['pause'], self.report)
+            finally:
+                cursor.execute('SELECT pg_advisory_unlock(%s, %s)', [ADVISORY_LOCK_NAMESPACE, deletion.id])
+
+    def report(self, deletion):
+        self.stdout.write('{} {}: {}, deleted {}'.format(
+            deletion.userType, deletion.profileId, deletion.stage,
+            ', '.join('{} {}'.format(count, stage) for stage, count in deletion.deletedRows.items()) or 'nothing'))
@@ -0,0 +1,51 @@
+import csv
+import json
+from timeit import default_timer as timer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from vgg_food_vendor_project.food_vendor_app.views import BulkAccountProvisioning
+
+
+class Command(BaseCommand):
+    help = 'Signs up many vendors or customers from a JSON list or a CSV file. Nothing is created unless every record is valid.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('user_type', choices=sorted(
+            BulkAccountProvisioning.profileModels.keys()))
+        parser.add_argument('path', help='A .json file holding a list of records, or a .csv file with a header row')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only validate the records')
+
+    def readRecords(self, path):
+        try:
+            with open(path, newline='') as recordsFile:
+                if path.endswith('.csv'):
+                    return list(csv.DictReader(recordsFile))
+                return json.load(recordsFile)
+        except (OSError, ValueError) as exc:
+            raise CommandError('Could not read {}: {}'.format(path, exc))
+
+    def handle(self, *args, **options):
+        start = timer()
+        records = self.readRecords(options['path'])
+        provisioning = BulkAccountProvisioning(options['user_type'], records)
+
+        if provisioning.errors:
+            for error in provisioning.errors:
+                self.stderr.write('Record {} ({}): {}'.format(
+                    error['index'], error.get('email'), '; '.join(error['errors'])))
+            raise CommandError('{} invalid records, no account was created'.format(
+                len(provisioning.errors)))
+
+        if options['dry_run']:
+            self.stdout.write('{} valid records'.format(len(provisioning.records)))
+            return
+
+        created = provisioning.save(settings.PROVISIONING_HASH_WORKERS)
+        if created is None:
+            for error in provisioning.errors:
+                self.stderr.write('Record {} ({}): {}'.format(
+                    error['index'], error.get('email'), '; '.join(error['errors'])))
+            raise CommandError('Records were signed up meanwhile, no account was created')
+        self.stdout.write('Created {} {}s in {:.1f}s'.format(
+            len(created), options['user_type'], timer() - start))
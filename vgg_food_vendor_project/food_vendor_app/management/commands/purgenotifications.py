@@ -0,0 +1,71 @@
+import gzip
+import os
+from datetime import timedelta
+from time import sleep
+import orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from vgg_food_vendor_project.food_vendor_app.models import Notification
+from vgg_food_vendor_project.food_vendor_app.serializers import notificationValues
+
+
+class Command(BaseCommand):
+    help = 'Archives notifications older than the retention period to gzipped NDJSON and deletes them in small id-ordered batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS,
+                            help='Keep notifications created in the last DAYS days')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.NOTIFICATION_PURGE_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=settings.NOTIFICATION_PURGE_PAUSE_SECONDS,
+                            help='Seconds to wait between batches')
+        parser.add_argument('--archive-dir', default=settings.NOTIFICATION_ARCHIVE_DIR)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the notifications to purge')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days and --batch-size must be positive')
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = Notification.objects.filter(dateTimeCreated__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write('{} notifications created before {} would be purged'.format(
+                expired.count(), cutoff.isoformat()))
+            return
+
+        os.makedirs(options['archive_dir'], exist_ok=True)
+        archivePath = os.path.join(options['archive_dir'], 'notifications-{}.ndjson.gz'.format(
+            timezone.now().strftime('%Y%m%dT%H%M%S')))
+
+        purged = 0
+        lastId = 0
+
+        with open(archivePath, 'xb') as archiveFile, gzip.GzipFile(fileobj=archiveFile, mode='wb') as archive:
+            while True:
+                rows = notificationValues.many(expired.filter(
+                    id__gt=lastId).order_by('id')[:options['batch_size']])
+                if not rows:
+                    break
+                lastId = rows[-1]['id']
+
+                # Rows are on disk before they are deleted
+                archive.write(b''.join(orjson.dumps(row) + b'\n' for row in rows))
+                archive.flush()
+                os.fsync(archiveFile.fileno())
+
+                Notification.objects.filter(
+                    id__in=[row['id'] for row in rows]).delete()
+                purged += len(rows)
+                self.stdout.write('Purged {} notifications up to id {}'.format(purged, lastId))
+
+                sleep(options['pause'])
+
+        if purged == 0:
+            os.remove(archivePath)
+            self.stdout.write('No notifications created before {}'.format(cutoff.isoformat()))
+            return
+
+        self.stdout.write('Archived and deleted {} notifications to {}'.format(purged, archivePath))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from vgg_food_vendor_project.food_vendor_app.models import ThrottleCounter
+
+
+class Command(BaseCommand):
+    help = 'Deletes the throttle counters of windows that are over, in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.THROTTLE_PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        expired = ThrottleCounter.objects.filter(expiresAt__lte=timezone.now())
+
+        purged = 0
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            purged += ThrottleCounter.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write('Deleted {} expired throttle counters'.format(purged))
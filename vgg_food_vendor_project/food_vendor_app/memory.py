@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import resource
+import signal
+import threading
+import tracemalloc
+from datetime import datetime, timezone
+from django.conf import settings
+
+
+memoryLogger = logging.getLogger('vgg_food_vendor_project.memory')
+
+
+def residentMemory():
+    """
+    Function that gives the resident memory of this process in bytes. Where /proc is missing,
+    the peak resident memory is given instead.
+    """
+
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryTracker():
+    def __init__(self):
+        """
+        Per-process tracemalloc control. Allocations are traced from `start` on, and
+        `report` gives the allocation sites that grew the most since the baseline snapshot.
+        """
+
+        # Reentrant, as the snapshot signal is handled in the main thread, which may hold it
+        self.lock = threading.RLock()
+        self.baseline = None
+        self.dateTimeBaseline = None
+
+    # Allocations made by tracemalloc itself and by imports would hide those of the app
+    snapshotFilters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ]
+
+    def snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self.snapshotFilters)
+
+    def start(self):
+        """
+        Function that starts tracing allocations if needed and takes a new baseline snapshot.
+        """
+
+        with self.lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(settings.MEMORY_TRACE_FRAMES)
+            self.baseline = self.snapshot()
+            self.dateTimeBaseline = datetime.now(timezone.utc)
+
+    def stop(self):
+        with self.lock:
+            tracemalloc.stop()
+            self.baseline = None
+            self.dateTimeBaseline = None
+
+    def status(self):
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            'pid': os.getpid(),
+            'rss': residentMemory(),
+            'tracing': tracing,
+            'traced': traced,
+            'tracedPeak': peak,
+            'dateTimeBaseline': self.dateTimeBaseline.isoformat() if self.dateTimeBaseline else None
+        }
+
+    def report(self, limit, groupBy='lineno'):
+        """
+        Function that gives the status of the process and the `limit` allocation sites, by file
+        and line or by file, whose size grew the most since the baseline. Without a baseline the
+        largest sites are given. Gives None if allocations are not traced.
+        """
+
+        with self.lock:
+            if not tracemalloc.is_tracing():
+                return None
+            current = self.snapshot()
+            baseline = self.baseline
+
+        if baseline:
+            statistics = current.compare_to(baseline, groupBy)
+        else:
+            statistics = current.statistics(groupBy)
+
+        sites = []
+        for statistic in statistics[:limit]:
+            frame = statistic.traceback[0]
+            sites.append({
+                'file': frame.filename,
+                'line': frame.lineno if groupBy == 'lineno' else None,
+                'size': statistic.size,
+                'sizeDiff': getattr(statistic, 'size_diff', None),
+                'count': statistic.count,
+                'countDiff': getattr(statistic, 'count_diff', None)
+            })
+        return {**self.status(), 'sites': sites}
+
+
+memoryTracker = MemoryTracker()
+
+
+def onSnapshotSignal(signum, frame):
+    """
+    Signal handler that starts tracing on its first delivery, then logs the allocation sites
+    that grew since then on every later one.
+    """
+
+    if not tracemalloc.is_tracing():
+        memoryTracker.start()
+        memoryLogger.warning(json.dumps({'event': 'baseline', **memoryTracker.status()}))
+    else:
+        memoryLogger.warning(json.dumps({'event': 'growth', **memoryTracker.report(
+            settings.MEMORY_REPORT_LIMIT)}))
+
+
+def installSnapshotSignalHandler():
+    """
+    Function that handles MEMORY_SNAPSHOT_SIGNAL in this process. Signal handlers can only be
+    set from the main thread, so nothing is done elsewhere (e.g. under the autoreloader).
+    """
+
+    signalName = settings.MEMORY_SNAPSHOT_SIGNAL
+    if not signalName or threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(getattr(signal, signalName), onSnapshotSignal)
@@ -0,0 +1,151 @@
+import hmac
+import json
+import logging
+import os
+import random
+import signal
+import threading
+from contextlib import ExitStack
+from time import perf_counter
+from django.conf import settings
+from django.db import connections
+from vgg_food_vendor_project.food_vendor_app.memory import memoryLogger, residentMemory
+from vgg_food_vendor_project.food_vendor_app.profiling import RequestProfile, routeName, saveProfile
+from vgg_food_vendor_project.food_vendor_app.routers import usePrimary
+from vgg_food_vendor_project.food_vendor_app.slowrequests import RequestTimings, requestState, slowRequestRecord
+
+
+slowRequestLogger = logging.getLogger('vgg_food_vendor_project.slowrequests')
+
+
+class ReplicaRoutingMiddleware():
+    """
+    Middleware that lets safe requests read from replicas. After a write, the client gets a
+    short-lived cookie that keeps its reads on the primary so it always reads its own writes,
+    whichever worker serves the next request.
+    """
+
+    safeMethods = ('GET', 'HEAD', 'OPTIONS')
+    stickyCookie = 'FVA-PRIMARY'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        isSafe = request.method in self.safeMethods
+        usePrimary(not isSafe or self.stickyCookie in request.COOKIES)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            usePrimary(True)
+
+        if not isSafe and settings.DATABASE_REPLICAS:
+            response.set_cookie(self.stickyCookie, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                                path='/api', httponly=True)
+        return response
+
+
+class ProfilingMiddleware():
+    """
+    Middleware that profiles a PROFILING_SAMPLE_RATE fraction of requests, and every request whose
+    X-FVA-Profile header carries PROFILING_DEBUG_TOKEN. Profiles are saved per route under
+    PROFILING_DIR and listed slowest first at /admin/profiles/. Only one request per process is
+    profiled at a time; others that would be sampled meanwhile are served as usual.
+    """
+
+    header = 'HTTP_X_FVA_PROFILE'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+
+    def isRequested(self, request):
+        token = settings.PROFILING_DEBUG_TOKEN
+        given = request.META.get(self.header)
+        return bool(token and given) and hmac.compare_digest(given.encode('utf-8'), token.encode('utf-8'))
+
+    def __call__(self, request):
+        requested = self.isRequested(request)
+        if not (requested or random.random() < settings.PROFILING_SAMPLE_RATE):
+            return self.get_response(request)
+        if not self.lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profile = RequestProfile()
+            start = perf_counter()
+            profile.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profile.stop()
+            duration = perf_counter() - start
+
+            route = routeName(request)
+            name = saveProfile(profile, route, duration)
+        finally:
+            self.lock.release()
+
+        if requested:
+            response['X-FVA-Profile'] = '{}/{}'.format(route, name)
+        return response
+
+
+class SlowRequestMiddleware():
+    """
+    Middleware that logs a JSON line for every request slower than the threshold of its route,
+    SLOW_REQUEST_ROUTE_THRESHOLDS_MS or else SLOW_REQUEST_THRESHOLD_MS. The line has the time
+    spent in auth, validation, serialization and the database, and the SLOW_REQUEST_TOP_QUERIES
+    statements that took the most time. Fast requests only pay for the timers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        requestState.timings = timings
+        start = perf_counter()
+
+        try:
+            with ExitStack() as stack:
+                for alias in settings.DATABASES:
+                    stack.enter_context(connections[alias].execute_wrapper(timings.recordQuery))
+                response = self.get_response(request)
+        finally:
+            requestState.timings = None
+        duration = perf_counter() - start
+
+        match = request.resolver_match
+        threshold = settings.SLOW_REQUEST_ROUTE_THRESHOLDS_MS.get(
+            match.route if match else None, settings.SLOW_REQUEST_THRESHOLD_MS)
+        if duration * 1000 >= threshold:
+            slowRequestLogger.warning(json.dumps(slowRequestRecord(
+                request, response, timings, duration, threshold, settings.SLOW_REQUEST_TOP_QUERIES)))
+        return response
+
+
+class WorkerMemoryLimitMiddleware():
+    """
+    Middleware that asks the worker to restart once its resident memory passes WORKER_MAX_RSS_MB,
+    when set. The worker gets SIGTERM after the response is built; gunicorn workers finish the
+    request and exit, and the master starts a fresh one.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.restarting = False
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        limit = settings.WORKER_MAX_RSS_MB
+        if limit and not self.restarting:
+            rss = residentMemory()
+            if rss > limit * 1024 * 1024:
+                self.restarting = True
+                memoryLogger.warning(json.dumps({'event': 'restart', 'pid': os.getpid(), 'rss': rss,
+                                                 'limit': limit * 1024 * 1024}))
+                os.kill(os.getpid(), signal.SIGTERM)
+        return response
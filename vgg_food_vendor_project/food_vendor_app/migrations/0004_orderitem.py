@@ -0,0 +1,32 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0003_auto_20200529_1440'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(default=1)),
+                ('unitPrice', models.FloatField()),
+                ('menuId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.menu')),
+                ('orderId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.order')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['menuId', 'orderId'], name='food_vendor_menuId__c8cc55_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='orderitem',
+            unique_together={('orderId', 'menuId')},
+        ),
+    ]
@@ -0,0 +1,51 @@
+from collections import Counter
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def backfillOrderItems(apps, schema_editor):
+    """
+    Creates OrderItem rows from Order.itemsOrdered, one batch of orders per transaction.
+    Repeated menu ids become the quantity and the current menu price is the best price snapshot available.
+    """
+
+    Menu = apps.get_model('food_vendor_app', 'Menu')
+    Order = apps.get_model('food_vendor_app', 'Order')
+    OrderItem = apps.get_model('food_vendor_app', 'OrderItem')
+
+    lastOrderId = 0
+    while True:
+        orders = list(Order.objects.filter(id__gt=lastOrderId).order_by(
+            'id').values_list('id', 'itemsOrdered')[:BATCH_SIZE])
+        if not orders:
+            break
+        lastOrderId = orders[-1][0]
+
+        menuIds = {menuId for orderId, itemsOrdered in orders for menuId in itemsOrdered}
+        prices = dict(Menu.objects.filter(
+            id__in=menuIds).values_list('id', 'price'))
+
+        orderItems = []
+        for orderId, itemsOrdered in orders:
+            for menuId, quantity in Counter(itemsOrdered).items():
+                # Menus deleted since the order was made cannot be linked
+                if menuId in prices:
+                    orderItems.append(OrderItem(orderId_id=orderId, menuId_id=menuId,
+                                                quantity=quantity, unitPrice=prices[menuId]))
+
+        with transaction.atomic():
+            OrderItem.objects.bulk_create(orderItems, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('food_vendor_app', '0004_orderitem'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfillOrderItems, migrations.RunPython.noop),
+    ]
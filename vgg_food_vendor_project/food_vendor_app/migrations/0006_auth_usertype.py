@@ -0,0 +1,23 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0005_backfill_orderitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auth',
+            name='profileId',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='auth',
+            name='userType',
+            field=models.CharField(max_length=16, null=True),
+        ),
+    ]
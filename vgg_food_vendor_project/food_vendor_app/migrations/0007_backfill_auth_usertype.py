@@ -0,0 +1,42 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def backfillAuthUserType(apps, schema_editor):
+    """
+    Stores the role and profile id of every Auth row from the Vendor and Customer tables,
+    one batch of profile ids per transaction. Logins looked up vendors before customers, so
+    an email with both profiles stays a vendor.
+    """
+
+    Auth = apps.get_model('food_vendor_app', 'Auth')
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+
+    for userType in ['vendor', 'customer']:
+        ProfileModel = apps.get_model('food_vendor_app', userType)
+        lastProfileId = ProfileModel.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        sql = 'UPDATE {auth} SET {userType} = %s, {profileId} = profile.id FROM {profile} profile ' \
+              'WHERE {auth}.{email} = profile.{email} AND {auth}.{userType} IS NULL ' \
+              'AND profile.id > %s AND profile.id <= %s'.format(
+                  auth=quote(Auth._meta.db_table), profile=quote(ProfileModel._meta.db_table),
+                  userType=quote('userType'), profileId=quote('profileId'), email=quote('email'))
+
+        for batchStart in range(0, lastProfileId, BATCH_SIZE):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [userType, batchStart, batchStart + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('food_vendor_app', '0006_auth_usertype'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfillAuthUserType, migrations.RunPython.noop),
+    ]
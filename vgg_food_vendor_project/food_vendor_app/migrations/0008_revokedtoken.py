@@ -0,0 +1,22 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0007_backfill_auth_usertype'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=64, unique=True)),
+                ('expiresAt', models.DateTimeField(db_index=True)),
+                ('dateTimeCreated', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0008_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auth',
+            index=models.Index(fields=['profileId', 'userType'], name='food_vendor_profile_6e0abc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['subjectUser', 'messageStatusId'], name='food_vendor_subject_bd5083_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['orderId', 'messageStatusId'], name='food_vendor_orderId_a89974_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Converts the order table to monthly range partitions on "dateAndTimeOfOrder", with a default
+# partition for anything outside them. Partitions are created from the month of the oldest order
+# to ORDER_PARTITION_MONTHS_AHEAD months ahead, the horizon `manage.py manageorderpartitions`
+# keeps up afterwards.
+# The primary key has to include the partition key, the ORM keeps using id alone.
+
+ORDER_INDEXES = """
+CREATE INDEX food_vendor_app_order_customerId_idx ON food_vendor_app_order ("customerId_id");
+CREATE INDEX food_vendor_app_order_vendorId_idx ON food_vendor_app_order ("vendorId_id", "dateAndTimeOfOrder");
+CREATE INDEX food_vendor_app_order_orderStatusId_idx ON food_vendor_app_order ("orderStatusId_id");
+
+ALTER TABLE food_vendor_app_order
+    ADD CONSTRAINT food_vendor_app_order_customerId_fk FOREIGN KEY ("customerId_id")
+        REFERENCES food_vendor_app_customer (id) DEFERRABLE INITIALLY DEFERRED,
+    ADD CONSTRAINT food_vendor_app_order_vendorId_fk FOREIGN KEY ("vendorId_id")
+        REFERENCES food_vendor_app_vendor (id) DEFERRABLE INITIALLY DEFERRED,
+    ADD CONSTRAINT food_vendor_app_order_orderStatusId_fk FOREIGN KEY ("orderStatusId_id")
+        REFERENCES food_vendor_app_orderstatus (id) DEFERRABLE INITIALLY DEFERRED;
+"""
+
+PARTITION_ORDERS = """
+ALTER TABLE food_vendor_app_order RENAME TO food_vendor_app_order_unpartitioned;
+
+CREATE TABLE food_vendor_app_order (
+    LIKE food_vendor_app_order_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY RANGE ("dateAndTimeOfOrder");
+
+ALTER SEQUENCE food_vendor_app_order_id_seq OWNED BY food_vendor_app_order.id;
+
+CREATE TABLE food_vendor_app_order_default PARTITION OF food_vendor_app_order DEFAULT;
+
+DO $$
+DECLARE
+    month date := date_trunc('month', COALESCE(
+        (SELECT min("dateAndTimeOfOrder") FROM food_vendor_app_order_unpartitioned), now()) AT TIME ZONE 'UTC');
+    lastMonth date := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{monthsAhead} months';
+BEGIN
+    WHILE month <= lastMonth LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF food_vendor_app_order FOR VALUES FROM (%L) TO (%L)',
+                       'food_vendor_app_order_p' || to_char(month, 'YYYY_MM'),
+                       month::timestamp AT TIME ZONE 'UTC',
+                       (month + interval '1 month')::timestamp AT TIME ZONE 'UTC');
+        month := month + interval '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO food_vendor_app_order SELECT * FROM food_vendor_app_order_unpartitioned;
+DROP TABLE food_vendor_app_order_unpartitioned;
+
+ALTER TABLE food_vendor_app_order ADD CONSTRAINT food_vendor_app_order_pkey
+    PRIMARY KEY (id, "dateAndTimeOfOrder");
+""".format(monthsAhead=int(settings.ORDER_PARTITION_MONTHS_AHEAD)) + ORDER_INDEXES
+
+UNPARTITION_ORDERS = """
+CREATE TABLE food_vendor_app_order_unpartitioned (
+    LIKE food_vendor_app_order INCLUDING DEFAULTS
+);
+INSERT INTO food_vendor_app_order_unpartitioned SELECT * FROM food_vendor_app_order;
+
+ALTER SEQUENCE food_vendor_app_order_id_seq OWNED BY food_vendor_app_order_unpartitioned.id;
+DROP TABLE food_vendor_app_order;
+ALTER TABLE food_vendor_app_order_unpartitioned RENAME TO food_vendor_app_order;
+
+ALTER TABLE food_vendor_app_order ADD CONSTRAINT food_vendor_app_order_pkey PRIMARY KEY (id);
+""" + ORDER_INDEXES
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0009_notification_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='orderId',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.order'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='orderId',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.order'),
+        ),
+        migrations.RunSQL(PARTITION_ORDERS, UNPARTITION_ORDERS),
+    ]
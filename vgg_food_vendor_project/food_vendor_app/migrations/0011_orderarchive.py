@@ -0,0 +1,41 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:42
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0010_order_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderArchive',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('description', models.TextField(null=True)),
+                ('itemsOrdered', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), size=None)),
+                ('orderItems', models.JSONField(default=list)),
+                ('amountDue', models.FloatField()),
+                ('amountPaid', models.FloatField()),
+                ('amountOutstanding', models.FloatField()),
+                ('dateAndTimeOfOrder', models.DateTimeField()),
+                ('preOrderDateTime', models.DateTimeField(null=True)),
+                ('dateTimeArchived', models.DateTimeField(auto_now_add=True)),
+                ('customerId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.customer')),
+                ('orderStatusId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.orderstatus')),
+                ('vendorId', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='food_vendor_app.vendor')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='orderarchive',
+            index=models.Index(fields=['vendorId', 'dateAndTimeOfOrder'], name='food_vendor_vendorI_6d0652_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderarchive',
+            index=models.Index(fields=['customerId', 'dateAndTimeOfOrder'], name='food_vendor_custome_0eb7d1_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0011_orderarchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auth',
+            name='isActive',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='AccountDeletion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('userType', models.CharField(max_length=16)),
+                ('profileId', models.IntegerField()),
+                ('stage', models.CharField(default='notifications', max_length=16)),
+                ('deletedRows', models.JSONField(default=dict)),
+                ('dateTimeCreated', models.DateTimeField(auto_now_add=True)),
+                ('dateTimeModified', models.DateTimeField(auto_now=True)),
+                ('dateTimeCompleted', models.DateTimeField(null=True)),
+            ],
+            options={
+                'unique_together': {('userType', 'profileId')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0012_accountdeletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='menuVersion',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:49
+
+from django.db import migrations, models
+
+
+# Every write to a menu stamps it with the id of the writing transaction, and every delete leaves a
+# tombstone stamped the same way. Transaction ids only grow, so `menu/changes/?since=` can hand out
+# the oldest transaction still running as its next token and never skip a late commit.
+
+TRACK_MENU_CHANGES = """
+CREATE FUNCTION food_vendor_app_menu_stamp() RETURNS trigger AS $$
+BEGIN
+    NEW."changeSequence" := txid_current();
+    RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER food_vendor_app_menu_stamp BEFORE INSERT OR UPDATE ON food_vendor_app_menu
+    FOR EACH ROW EXECUTE PROCEDURE food_vendor_app_menu_stamp();
+
+CREATE FUNCTION food_vendor_app_menu_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO food_vendor_app_menutombstone ("menuId", "vendorId", "changeSequence", "dateTimeDeleted")
+        VALUES (OLD.id, OLD."vendorId_id", txid_current(), now());
+    RETURN OLD;
+END $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER food_vendor_app_menu_tombstone AFTER DELETE ON food_vendor_app_menu
+    FOR EACH ROW EXECUTE PROCEDURE food_vendor_app_menu_tombstone();
+"""
+
+UNTRACK_MENU_CHANGES = """
+DROP TRIGGER food_vendor_app_menu_tombstone ON food_vendor_app_menu;
+DROP FUNCTION food_vendor_app_menu_tombstone();
+DROP TRIGGER food_vendor_app_menu_stamp ON food_vendor_app_menu;
+DROP FUNCTION food_vendor_app_menu_stamp();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0013_vendor_menuversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuTombstone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('menuId', models.IntegerField()),
+                ('vendorId', models.IntegerField()),
+                ('changeSequence', models.BigIntegerField(db_index=True)),
+                ('dateTimeDeleted', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='changeSequence',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='dateTimeModified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunSQL(TRACK_MENU_CHANGES, UNTRACK_MENU_CHANGES),
+    ]
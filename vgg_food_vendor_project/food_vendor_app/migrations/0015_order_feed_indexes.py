@@ -0,0 +1,29 @@
+# Generated by Django 3.1.6 on 2026-10-19 16:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0014_menu_changes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['vendorId', 'orderStatusId', 'dateAndTimeOfOrder'], name='order_vendor_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(preOrderDateTime__isnull=False), fields=['vendorId', 'preOrderDateTime'], name='order_vendor_preorder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(amountOutstanding__gt=0), fields=['vendorId', 'dateAndTimeOfOrder'], name='order_vendor_unpaid_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['vendorId', 'amountOutstanding'], name='order_vendor_outstanding_idx'),
+        ),
+    ]
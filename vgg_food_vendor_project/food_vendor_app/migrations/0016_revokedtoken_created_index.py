@@ -0,0 +1,18 @@
+# Generated by Django 3.1.6 on 2026-10-19 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0015_order_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='revokedtoken',
+            name='dateTimeCreated',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.1.6 on 2026-10-19 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0016_revokedtoken_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=128, unique=True)),
+                ('count', models.IntegerField(default=0)),
+                ('expiresAt', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
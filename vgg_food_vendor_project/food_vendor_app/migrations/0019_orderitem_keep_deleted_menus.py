@@ -0,0 +1,19 @@
+# Generated by Django 3.1.6 on 2026-10-19 17:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0018_vendor_isactive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitem',
+            name='menuId',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, to='food_vendor_app.menu'),
+        ),
+    ]
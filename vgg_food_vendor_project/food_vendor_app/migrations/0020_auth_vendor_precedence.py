@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def restoreVendorPrecedence(apps, schema_editor):
+    """
+    Gives back the vendor role to the Auth rows of emails with both a vendor and a customer
+    profile, which an earlier backfill left as customers.
+    """
+
+    Auth = apps.get_model('food_vendor_app', 'Auth')
+    Vendor = apps.get_model('food_vendor_app', 'Vendor')
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE {auth} SET {userType} = %s, {profileId} = profile.id FROM {profile} profile '
+            'WHERE {auth}.{email} = profile.{email} AND {auth}.{userType} = %s'.format(
+                auth=quote(Auth._meta.db_table), profile=quote(Vendor._meta.db_table),
+                userType=quote('userType'), profileId=quote('profileId'), email=quote('email')),
+            ['vendor', 'customer'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_vendor_app', '0019_orderitem_keep_deleted_menus'),
+    ]
+
+    operations = [
+        migrations.RunPython(restoreVendorPrecedence, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,12 @@ class Vendor(models.Model):
 
     phoneNumber = models.CharField(max_length=32, unique=True)
 
+    # Bumped by every write to the vendor's menus
+    menuVersion = models.IntegerField(default=0)
+
+    # Cleared as soon as the vendor is scheduled for deletion, which hides it and its menus
+    isActive = models.BooleanField(default=True)
+
     dateTimeCreated = models.DateTimeField(auto_now_add=True, editable=False)
 
     dateTimeModified = models.DateTimeField(auto_now=True, editable=False)
@@ -37,10 +43,62 @@ class Auth(models.Model):
 
     password = models.TextField()
 
+    userType = models.CharField(max_length=16, null=True)
+
+    profileId = models.IntegerField(null=True)
+
+    # Cleared as soon as the account is scheduled for deletion
+    isActive = models.BooleanField(default=True)
+
     dateTimeCreated = models.DateTimeField(auto_now_add=True, editable=False)
 
     dateTimeModified = models.DateTimeField(auto_now=True, editable=False)
 
+    class Meta:
+        indexes = [models.Index(fields=['profileId', 'userType'])]
+
+
+class RevokedToken(models.Model):
+
+    jti = models.CharField(max_length=64, unique=True)
+
+    expiresAt = models.DateTimeField(db_index=True)
+
+    # Revocation lists refresh from the rows created since their last refresh
+    dateTimeCreated = models.DateTimeField(auto_now_add=True, editable=False, db_index=True)
+
+
+class ThrottleCounter(models.Model):
+
+    # Throttle scope, client and fixed window counted
+    key = models.CharField(max_length=128, unique=True)
+
+    count = models.IntegerField(default=0)
+
+    # Nothing reads a counter once the window after its own is over
+    expiresAt = models.DateTimeField(db_index=True)
+
+
+class AccountDeletion(models.Model):
+
+    userType = models.CharField(max_length=16)
+
+    profileId = models.IntegerField()
+
+    # Dependents are deleted bottom-up, one stage after the other
+    stage = models.CharField(max_length=16, default='notifications')
+
+    deletedRows = models.JSONField(default=dict)
+
+    dateTimeCreated = models.DateTimeField(auto_now_add=True, editable=False)
+
+    dateTimeModified = models.DateTimeField(auto_now=True, editable=False)
+
+    dateTimeCompleted = models.DateTimeField(null=True)
+
+    class Meta:
+        unique_together = [['userType', 'profileId']]
+
 
 class Menu(models.Model):
 
@@ -56,6 +114,11 @@ class Menu(models.Model):
 
     dateTimeCreated = models.DateTimeField(auto_now_add=True, editable=False)
 
+    dateTimeModified = models.DateTimeField(auto_now=True, editable=False)
+
+    # Id of the last transaction that wrote the menu, set by a database trigger
+    changeSequence = models.BigIntegerField(default=0, editable=False, db_index=True)
+
     vendorId = models.ForeignKey("Vendor", on_delete=models.CASCADE)
 
     isRecurring = models.BooleanField(default=False)
@@ -64,6 +127,18 @@ class Menu(models.Model):
         base_field=models.CharField(max_length=10), size=7)
 
 
+class MenuTombstone(models.Model):
+
+    # Written by a database trigger whenever a menu is deleted
+    menuId = models.IntegerField()
+
+    vendorId = models.IntegerField()
+
+    changeSequence = models.BigIntegerField(db_index=True)
+
+    dateTimeDeleted = models.DateTimeField()
+
+
 class Order(models.Model):
 
     customerId = models.ForeignKey("Customer", on_delete=models.CASCADE)
@@ -87,6 +162,71 @@ class Order(models.Model):
 
     preOrderDateTime = models.DateTimeField(null=True)
 
+    # Indexes of the vendor order feed, (vendorId, dateAndTimeOfOrder) is created with the partitions
+    class Meta:
+        indexes = [
+            models.Index(fields=['vendorId', 'orderStatusId', 'dateAndTimeOfOrder'],
+                         name='order_vendor_status_date_idx'),
+            models.Index(fields=['vendorId', 'preOrderDateTime'], name='order_vendor_preorder_idx',
+                         condition=models.Q(preOrderDateTime__isnull=False)),
+            models.Index(fields=['vendorId', 'dateAndTimeOfOrder'], name='order_vendor_unpaid_date_idx',
+                         condition=models.Q(amountOutstanding__gt=0)),
+            models.Index(fields=['vendorId', 'amountOutstanding'], name='order_vendor_outstanding_idx'),
+        ]
+
+
+class OrderItem(models.Model):
+
+    # Orders are range partitioned by date, so their id alone cannot back a database constraint
+    orderId = models.ForeignKey(
+        "Order", on_delete=models.CASCADE, db_constraint=False)
+
+    # Deleting a menu keeps the lines of the orders it was part of, still pointing at its id
+    menuId = models.ForeignKey("Menu", on_delete=models.DO_NOTHING, db_constraint=False)
+
+    quantity = models.IntegerField(default=1)
+
+    unitPrice = models.FloatField()
+
+    class Meta:
+        unique_together = [['orderId', 'menuId']]
+        indexes = [models.Index(fields=['menuId', 'orderId'])]
+
+
+class OrderArchive(models.Model):
+
+    # Completed and paid orders moved out of Order keep their original id
+    id = models.IntegerField(primary_key=True)
+
+    customerId = models.ForeignKey("Customer", on_delete=models.CASCADE)
+
+    vendorId = models.ForeignKey("Vendor", on_delete=models.CASCADE)
+
+    description = models.TextField(null=True)
+
+    itemsOrdered = ArrayField(base_field=models.IntegerField())
+
+    # Lines of the order as they were in OrderItem
+    orderItems = models.JSONField(default=list)
+
+    amountDue = models.FloatField()
+
+    amountPaid = models.FloatField()
+
+    amountOutstanding = models.FloatField()
+
+    orderStatusId = models.ForeignKey("OrderStatus", on_delete=models.CASCADE)
+
+    dateAndTimeOfOrder = models.DateTimeField()
+
+    preOrderDateTime = models.DateTimeField(null=True)
+
+    dateTimeArchived = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=['vendorId', 'dateAndTimeOfOrder']),
+                   models.Index(fields=['customerId', 'dateAndTimeOfOrder'])]
+
 
 class OrderStatus(models.Model):
 
@@ -97,7 +237,9 @@ class Notification(models.Model):
 
     subjectUser = models.ForeignKey("Auth", on_delete=models.CASCADE)
 
-    orderId = models.ForeignKey("Order", on_delete=models.CASCADE)
+    # Orders are range partitioned by date, so their id alone cannot back a database constraint
+    orderId = models.ForeignKey(
+        "Order", on_delete=models.CASCADE, db_constraint=False)
 
     message = models.TextField()
 
@@ -106,6 +248,10 @@ class Notification(models.Model):
     messageStatusId = models.ForeignKey(
         "MessageStatus", on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [models.Index(fields=['subjectUser', 'messageStatusId']),
+                   models.Index(fields=['orderId', 'messageStatusId'])]
+
 
 class MessageStatus(models.Model):
 
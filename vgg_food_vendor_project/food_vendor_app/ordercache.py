@@ -0,0 +1,116 @@
+import os
+import threading
+from hashlib import blake2b
+from time import time_ns
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+
+class CustomerOrderCache():
+    def __init__(self, cache):
+        """
+        Serialized order lists and order details of each customer, kept in the shared 'orders'
+        cache under the customer's current version. Every write to an order of the customer
+        moves the version on, so older entries are never read again and expire on their own
+        after ORDER_CACHE_SECONDS. Hit and invalidation counts are kept per process.
+        """
+
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def versionKey(customerId):
+        return 'orders:{}:version'.format(customerId)
+
+    def version(self, customerId):
+        key = self.versionKey(customerId)
+        version = self.cache.get(key)
+        if version is None:
+            # A fresh version never meets entries saved under one that was evicted
+            self.cache.add(key, time_ns(), None)
+            version = self.cache.get(key)
+        return version
+
+    def key(self, customerId, version, orderId, fields):
+        fieldsDigest = blake2b(','.join(fields).encode('utf-8'), digest_size=8).hexdigest()
+        return 'orders:{}:{}:{}:{}'.format(customerId, version, orderId or 'list', fieldsDigest)
+
+    def get(self, customerId, orderId, fields, load):
+        """
+        Function that gives the cached order list (with no `orderId`) or order of a customer
+        with the given fields, or calls `load` and caches what it gives unless that is None.
+        The version is read before `load`, so data loaded during a write is never kept under
+        the version that follows it.
+        """
+
+        key = self.key(customerId, self.version(customerId), orderId, fields)
+        data = self.cache.get(key)
+
+        with self.lock:
+            if data is not None:
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = load()
+        if data is not None:
+            self.cache.set(key, data, settings.ORDER_CACHE_SECONDS)
+        return data
+
+    def bump(self, customerId):
+        try:
+            self.cache.incr(self.versionKey(customerId))
+        except ValueError:
+            # No version means nothing is cached for the customer
+            pass
+
+    def invalidate(self, *customerIds):
+        """
+        Function that drops what is cached for customers whose orders change. The version moves
+        on at once and again when the current transaction commits, so a read made before the
+        commit cannot keep the old orders under the new version.
+        """
+
+        for customerId in set(customerIds):
+            self.bump(customerId)
+            transaction.on_commit(lambda customerId=customerId: self.bump(customerId))
+
+        with self.lock:
+            self.invalidations += len(set(customerIds))
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'pid': os.getpid(), 'hits': self.hits, 'misses': self.misses,
+                    'hitRate': self.hits / lookups if lookups else None,
+                    'invalidations': self.invalidations}
+
+
+# Backends other dynos do not read from, or whose incr is a separate read and write
+
+unsharedCacheBackends = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.db.DatabaseCache',
+]
+
+
+def checkOrderCacheBackend():
+    """
+    Function that refuses an 'orders' cache that would keep stale orders on some dynos after
+    they were invalidated on another.
+    """
+
+    backend = settings.CACHES['orders']['BACKEND']
+    if backend in unsharedCacheBackends:
+        raise ImproperlyConfigured(
+            "The 'orders' cache must be shared by all dynos and incr atomically, {} is not: set "
+            "ORDER_CACHE_BACKEND to a memcached backend or leave it unset".format(backend))
+
+
+customerOrderCache = CustomerOrderCache(caches['orders'])
@@ -0,0 +1,31 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Kept free of Django imports so that process pool workers can import it on their own
+
+
+def hashPassword(password):
+    """
+    Function that hashes a password with bcrypt.
+    """
+
+    import bcrypt
+
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+
+def hashPasswords(passwords, workers=None):
+    """
+    Function that hashes many passwords across a process pool, keeping their order.
+    A pool is not worth starting for a single password. `workers` defaults to one per CPU.
+    Pools fork the caller, so web workers hash with a single worker.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    if len(passwords) < 2 or workers == 1:
+        return [hashPassword(password) for password in passwords]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(passwords) // (4 * workers))
+        return list(executor.map(hashPassword, passwords, chunksize=chunksize))
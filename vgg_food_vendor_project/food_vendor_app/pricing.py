@@ -0,0 +1,81 @@
+import sys
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models import F
+from vgg_food_vendor_project.food_vendor_app.models import Menu, Vendor
+
+
+def bumpMenuVersion(vendorId):
+    """
+    Function that marks the menus of a vendor as changed. It must run in the transaction of the
+    menu write, so the new version and the new menus become visible together.
+    """
+
+    Vendor.objects.filter(id=vendorId).update(menuVersion=F('menuVersion') + 1)
+
+
+class PriceIndex():
+    def __init__(self):
+        """
+        Per-process menu prices of the most recently ordered-from vendors, least recently used
+        first. Each vendor's prices are kept with the menu version they were loaded at and
+        reloaded as soon as the version in the database moves on. The index is bounded to about
+        PRICE_INDEX_MAX_BYTES.
+        """
+
+        self.lock = threading.Lock()
+        self.vendors = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def estimateSize(prices):
+        # The dict itself plus an int key and a float value for every menu
+        return sys.getsizeof(prices) + len(prices) * 56
+
+    def load(self, vendorId, version):
+        prices = dict(Menu.objects.filter(vendorId=vendorId).values_list('id', 'price'))
+
+        with self.lock:
+            previous = self.vendors.pop(vendorId, None)
+            if previous:
+                self.size -= previous[2]
+            size = self.estimateSize(prices)
+            self.vendors[vendorId] = (version, prices, size)
+            self.size += size
+
+            while self.size > settings.PRICE_INDEX_MAX_BYTES and len(self.vendors) > 1:
+                evicted = self.vendors.popitem(last=False)[1]
+                self.size -= evicted[2]
+        return prices
+
+    def prices(self, vendorId):
+        """
+        Function that gives the prices of the menus of a vendor by menu id, or None if there is
+        no such active vendor. The version is read before any menu, so prices loaded during a concurrent
+        update are never kept under the newer version.
+        """
+
+        version = Vendor.objects.filter(id=vendorId, isActive=True).values_list('menuVersion', flat=True).first()
+        if version is None:
+            return None
+
+        with self.lock:
+            cached = self.vendors.get(vendorId)
+            if cached and cached[0] == version:
+                self.vendors.move_to_end(vendorId)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        return self.load(vendorId, version)
+
+    def clear(self):
+        with self.lock:
+            self.vendors.clear()
+            self.size = 0
+
+
+priceIndex = PriceIndex()
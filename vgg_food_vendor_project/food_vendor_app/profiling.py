@@ -0,0 +1,145 @@
+import cProfile
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from django.conf import settings
+
+
+class StackSampler():
+    def __init__(self, threadId, interval):
+        """
+        Thread that records the Python stack of another thread every `interval` seconds. The
+        stacks are counted in collapsed form, outermost frame first, ready for flamegraph tools.
+        """
+
+        self.threadId = threadId
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    @staticmethod
+    def frameName(frame):
+        code = frame.f_code
+        return '{}:{}:{}'.format(os.path.basename(code.co_filename), code.co_name, code.co_firstlineno)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.threadId)
+            names = []
+            while frame is not None:
+                names.append(self.frameName(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def collapsed(self):
+        return ''.join('{} {}\n'.format(stack, count) for stack, count in self.stacks.most_common())
+
+
+class RequestProfile():
+    def __init__(self):
+        """
+        cProfile plus a stack sampler around one request of the current thread.
+        """
+
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), settings.PROFILING_SAMPLE_INTERVAL_SECONDS)
+
+    def start(self):
+        self.sampler.start()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.sampler.stop()
+
+
+def routeName(request):
+    """
+    Function that gives a file name safe name of the route of a request, like
+    `GET-api-auth-vendor-menu-menu_id`.
+    """
+
+    match = request.resolver_match
+    route = match.route if match else 'unresolved'
+    return '-'.join([request.method] + re.findall(r'[A-Za-z0-9_]+', route))
+
+
+def saveProfile(profile, route, duration):
+    """
+    Function that writes the `.pstats` and `.collapsed` files of a profiled request to the
+    directory of its route, then removes the oldest profiles of the route beyond
+    PROFILING_KEEP_PER_ROUTE. Gives the name of the saved profile.
+    """
+
+    directory = os.path.join(settings.PROFILING_DIR, route)
+    os.makedirs(directory, exist_ok=True)
+
+    # Durations go in the file name so profiles can be listed without loading them
+    name = '{}-{}ms'.format(datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f'), round(duration * 1000))
+    profile.profiler.dump_stats(os.path.join(directory, name + '.pstats'))
+    with open(os.path.join(directory, name + '.collapsed'), 'w') as collapsed:
+        collapsed.write(profile.sampler.collapsed())
+
+    names = sorted(os.path.splitext(f)[0] for f in os.listdir(directory) if f.endswith('.pstats'))
+    for old in names[:-settings.PROFILING_KEEP_PER_ROUTE]:
+        for extension in ('.pstats', '.collapsed'):
+            try:
+                os.remove(os.path.join(directory, old + extension))
+            except FileNotFoundError:
+                pass
+
+    return name
+
+
+profileNamePattern = re.compile(r'^(\d{8}T\d{12})-(\d+)ms\.pstats$')
+
+
+def capturedProfiles():
+    """
+    Function that lists the saved profiles, slowest first.
+    """
+
+    profiles = []
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return profiles
+
+    for route in os.listdir(settings.PROFILING_DIR):
+        directory = os.path.join(settings.PROFILING_DIR, route)
+        if not os.path.isdir(directory):
+            continue
+        for fileName in os.listdir(directory):
+            match = profileNamePattern.match(fileName)
+            if match:
+                profiles.append({
+                    'route': route,
+                    'name': fileName[:-len('.pstats')],
+                    'dateTimeCaptured': datetime.strptime(match.group(1), '%Y%m%dT%H%M%S%f').replace(
+                        tzinfo=timezone.utc),
+                    'durationMs': int(match.group(2))
+                })
+
+    return sorted(profiles, key=lambda p: p['durationMs'], reverse=True)
+
+
+def profilePath(route, name, extension):
+    """
+    Function that gives the path of a saved profile file, or None if the names could step
+    outside PROFILING_DIR or the file does not exist.
+    """
+
+    if extension not in ('pstats', 'collapsed') or not re.fullmatch(r'[A-Za-z0-9_-]+', route + name):
+        return None
+    path = os.path.join(settings.PROFILING_DIR, route, '{}.{}'.format(name, extension))
+    return path if os.path.isfile(path) else None
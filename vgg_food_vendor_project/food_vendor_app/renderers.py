@@ -0,0 +1,99 @@
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from vgg_food_vendor_project.food_vendor_app.slowrequests import timedStage
+
+
+# DRF's encoder handles everything orjson and msgpack cannot encode natively (lazy strings,
+# decimals, querysets...). Datetimes are passed through to it as well so they keep DRF's
+# isoformat output with a trailing 'Z' instead of the encoders' own formats.
+
+encoderDefault = JSONEncoder().default
+
+orjsonOptions = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer which serializes to compact JSON with orjson, producing the same bytes as DRF's
+    JSONRenderer for finite floats in the usual range. Indented output (e.g. for the browsable
+    API) is left to JSONRenderer.
+    """
+
+    @timedStage('serialization')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encoderDefault, option=orjsonOptions)
+
+        # Keep the output a strict javascript subset, as JSONRenderer does
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON-serialized data with orjson.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parses the incoming bytestream as JSON and returns the resulting data.
+        """
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack for the mobile apps.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    @timedStage('serialization')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into MessagePack, returning a bytestring.
+        """
+
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encoderDefault, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses MessagePack-serialized data.
+    """
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parses the incoming bytestream as MessagePack and returns the resulting data.
+        """
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
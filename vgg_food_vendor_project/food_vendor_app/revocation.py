@@ -0,0 +1,125 @@
+import math
+import threading
+from datetime import timedelta
+from hashlib import blake2b
+from time import monotonic
+from django.conf import settings
+from django.db import router
+from django.utils.timezone import now
+from vgg_food_vendor_project.food_vendor_app.models import RevokedToken
+
+
+class BloomFilter():
+    def __init__(self, capacity, errorRate):
+        """
+        Bit array sized for `capacity` items at the given false positive rate. Item positions come
+        from double hashing one 128 bit blake2b digest.
+        """
+
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(errorRate) / math.log(2) ** 2))
+        self.hashCount = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        digest = blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(first + i * second) % size for i in range(self.hashCount)]
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        for position in self.positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationList():
+    def __init__(self):
+        """
+        Per-process view of the RevokedToken table. Revoked ids are kept in a Bloom filter that is
+        refreshed with the rows added since the last refresh at most every
+        TOKEN_REVOCATION_REFRESH_SECONDS, so only probable hits touch the database. The table
+        is always read on the primary, as a revocation must not wait for a replica.
+        """
+
+        self.lock = threading.Lock()
+        self.bloomFilter = None
+        self.refreshedFrom = None
+        self.recentIds = set()
+        self.refreshedAt = None
+
+    @staticmethod
+    def revokedTokens():
+        return RevokedToken.objects.using(router.db_for_write(RevokedToken))
+
+    def rebuild(self):
+        capacity = settings.TOKEN_REVOCATION_CAPACITY
+        unexpired = self.revokedTokens().filter(expiresAt__gt=now()).count()
+        while capacity < unexpired * 2:
+            capacity *= 2
+        self.bloomFilter = BloomFilter(capacity, settings.TOKEN_REVOCATION_ERROR_RATE)
+        self.refreshedFrom = None
+        self.recentIds = set()
+
+    def refresh(self):
+        with self.lock:
+            if self.bloomFilter is None or self.bloomFilter.count >= self.bloomFilter.capacity:
+                self.rebuild()
+
+            # Rows commit in any order, so a row may appear after later rows were read. Every
+            # refresh reads again the rows created during the overlap before the previous one,
+            # and only adds those it has not seen yet
+            startedAt = now()
+            overlap = timedelta(seconds=settings.TOKEN_REVOCATION_OVERLAP_SECONDS)
+            revoked = self.revokedTokens().filter(expiresAt__gt=startedAt)
+            if self.refreshedFrom is not None:
+                revoked = revoked.filter(dateTimeCreated__gte=self.refreshedFrom - overlap)
+
+            recentIds = set()
+            for revokedId, jti, dateTimeCreated in revoked.values_list('id', 'jti', 'dateTimeCreated'):
+                if revokedId not in self.recentIds:
+                    self.bloomFilter.add(jti)
+                if dateTimeCreated >= startedAt - overlap:
+                    recentIds.add(revokedId)
+
+            self.recentIds = recentIds
+            self.refreshedFrom = startedAt
+            self.refreshedAt = monotonic()
+
+    def isRevoked(self, jti):
+        """
+        Function that tells whether a token id has been revoked.
+        """
+
+        if not jti:
+            return False
+
+        if self.refreshedAt is None or monotonic() - self.refreshedAt > settings.TOKEN_REVOCATION_REFRESH_SECONDS:
+            self.refresh()
+
+        if jti not in self.bloomFilter:
+            return False
+        return self.revokedTokens().filter(jti=jti).exists()
+
+    def revoke(self, jti, expiresAt):
+        """
+        Function that records a revoked token id. It takes effect at once in this process and
+        within TOKEN_REVOCATION_REFRESH_SECONDS in the others.
+        """
+
+        RevokedToken.objects.get_or_create(jti=jti, defaults={'expiresAt': expiresAt})
+        if self.bloomFilter is not None:
+            with self.lock:
+                self.bloomFilter.add(jti)
+
+
+revocationList = RevocationList()
@@ -0,0 +1,95 @@
+import random
+import threading
+from time import monotonic
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+
+# Per-thread routing state, set for every request by ReplicaRoutingMiddleware
+
+routingState = threading.local()
+
+
+def usePrimary(pinned=True):
+    """
+    Function that pins (or unpins) reads of the current thread to the primary database.
+    """
+
+    routingState.pinned = pinned
+
+
+def isPinnedToPrimary():
+    return getattr(routingState, 'pinned', True)
+
+
+class ReplicaHealth():
+    def __init__(self):
+        """
+        Per-process record of replica health. Each replica is checked at most once per
+        REPLICA_HEALTH_CHECK_INTERVAL seconds, and a replica that cannot be reached or lags
+        more than REPLICA_MAX_LAG_SECONDS behind the primary is skipped until its next check.
+        """
+
+        self.lock = threading.Lock()
+        self.checks = {}
+
+    def check(self, alias):
+        try:
+            with connections[alias].cursor() as cursor:
+                # A replica that has replayed all the WAL it received is caught up, however
+                # long ago the primary last wrote; otherwise the lag is the age of the last
+                # replayed transaction
+                cursor.execute(
+                    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                    'ELSE EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())) END')
+                lag = cursor.fetchone()[0]
+        except DatabaseError:
+            connections[alias].close()
+            return False
+
+        # A database that is not replaying WAL reports no lag
+        return lag is None or lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    def isHealthy(self, alias):
+        now = monotonic()
+        with self.lock:
+            healthy, checkedAt = self.checks.get(alias, (True, None))
+            if checkedAt is not None and now - checkedAt < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+                return healthy
+            # Record the check up front so concurrent threads keep using the last result
+            self.checks[alias] = (healthy, now)
+
+        healthy = self.check(alias)
+        with self.lock:
+            self.checks[alias] = (healthy, monotonic())
+        return healthy
+
+
+replicaHealth = ReplicaHealth()
+
+
+class ReadReplicaRouter():
+    """
+    Database router that sends reads to a healthy replica when the current request allows it,
+    and everything else to the primary ('default') database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if isPinnedToPrimary():
+            return 'default'
+
+        replicas = [alias for alias in settings.DATABASE_REPLICAS
+                    if replicaHealth.isHealthy(alias)]
+        if not replicas:
+            return 'default'
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -1,62 +1,195 @@
+from django.utils import timezone
 from rest_framework import serializers
 from vgg_food_vendor_project.food_vendor_app import models as inAppModels
+from vgg_food_vendor_project.food_vendor_app.slowrequests import timedStage
 
 
-class VendorSerializer(serializers.ModelSerializer):
+def sparseFields(queryParams, fields):
+    """
+    Function that picks the serializer fields asked for in `fields=`, or all but those in
+    `exclude=`, both comma separated. `id` is always kept. Unknown fields raise a ValueError.
+    """
+
+    if 'fields' in queryParams.keys():
+        requested = [name for name in queryParams['fields'].split(',') if name]
+        unknown = [name for name in requested if name not in fields]
+        if unknown:
+            raise ValueError(unknown)
+        return [name for name in fields if name == 'id' or name in requested]
+
+    if 'exclude' in queryParams.keys():
+        excluded = [name for name in queryParams['exclude'].split(',') if name]
+        unknown = [name for name in excluded if name not in fields]
+        if unknown:
+            raise ValueError(unknown)
+        return [name for name in fields if name == 'id' or name not in excluded]
+
+    return list(fields)
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        Model serializer that only outputs the given fields, when there are some.
+        """
+
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields.keys()) - set(fields):
+                self.fields.pop(name)
+
+    @timedStage('validation')
+    def is_valid(self, raise_exception=False):
+        return super().is_valid(raise_exception=raise_exception)
+
+    @timedStage('serialization')
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+class VendorSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Vendor
         fields = ['id', 'businessName', 'email', 'phoneNumber',
                   'dateTimeCreated', 'dateTimeModified']
 
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Customer
         fields = ['id', 'firstname', 'lastname', 'email', 'phoneNumber',
                   'dateTimeCreated', 'dateTimeModified']
 
 
-class AuthSerializer(serializers.ModelSerializer):
+class AuthSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Auth
         fields = ['id', 'email', 'password',
                   'dateTimeCreated', 'dateTimeModified']
 
 
-class MenuSerializer(serializers.ModelSerializer):
+class AccountDeletionSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = inAppModels.AccountDeletion
+        fields = ['id', 'userType', 'profileId', 'stage', 'deletedRows',
+                  'dateTimeCreated', 'dateTimeModified', 'dateTimeCompleted']
+
+
+class MenuSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Menu
         fields = ['id', 'name', 'description', 'price', 'quantity', 'unit',
-                  'dateTimeCreated', 'vendorId', 'isRecurring', 'frequencyOfReoccurrence']
+                  'dateTimeCreated', 'dateTimeModified', 'vendorId', 'isRecurring', 'frequencyOfReoccurrence']
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Order
         fields = ['id', 'customerId', 'vendorId', 'description', 'itemsOrdered', 'amountDue',
                   'amountPaid', 'amountOutstanding', 'orderStatusId', 'dateAndTimeOfOrder', 'preOrderDateTime']
 
 
-class Order_OrderStatusSerializer(serializers.ModelSerializer):
+class OrderArchiveSerializer(SparseFieldsSerializer):
+    class Meta:
+        model = inAppModels.OrderArchive
+        fields = ['id', 'customerId', 'vendorId', 'description', 'itemsOrdered', 'orderItems', 'amountDue',
+                  'amountPaid', 'amountOutstanding', 'orderStatusId', 'dateAndTimeOfOrder', 'preOrderDateTime',
+                  'dateTimeArchived']
+
+
+class Order_OrderStatusSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Order
         fields = ['orderStatusId']
 
 
-class OrderStatusSerializer(serializers.ModelSerializer):
+class OrderStatusSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.OrderStatus
         fields = ['id', 'name']
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.Notification
         fields = ['id', 'subjectUser', 'orderId',
                   'message', 'dateTimeCreated', 'messageStatusId']
 
 
-class MessageStatusSerializer(serializers.ModelSerializer):
+class MessageStatusSerializer(SparseFieldsSerializer):
     class Meta:
         model = inAppModels.MessageStatus
         fields = ['id', 'name']
+
+
+class ValuesReadSerializer():
+    def __init__(self, modelSerializer):
+        """
+        Read-only fast path for a model serializer. Rows are fetched with .values_list() on the
+        serializer's fields and only datetime fields are converted, giving the same output as the
+        model serializer without building model instances.
+        """
+
+        self.model = modelSerializer.Meta.model
+        self.fields = list(modelSerializer.Meta.fields)
+
+        serializerFields = modelSerializer().fields
+        self.dateTimeFieldNames = set(name for name in self.fields
+                                      if isinstance(serializerFields[name], serializers.DateTimeField))
+
+    def formatDateTime(self, value, currentTimezone):
+        """
+        Function that formats a datetime exactly as DRF's ISO 8601 DateTimeField does.
+        """
+
+        if not value:
+            return None
+        value = value.astimezone(currentTimezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def toRepresentation(self, rows, fields):
+        """
+        Function that turns value rows of the given fields into serialized dictionaries.
+        """
+
+        dateTimeFields = [index for index, name in enumerate(fields) if name in self.dateTimeFieldNames]
+        formatDateTime = self.formatDateTime
+        currentTimezone = timezone.get_current_timezone()
+
+        data = []
+        for row in rows:
+            if dateTimeFields:
+                row = list(row)
+                for index in dateTimeFields:
+                    row[index] = formatDateTime(row[index], currentTimezone)
+            data.append(dict(zip(fields, row)))
+        return data
+
+    @timedStage('serialization')
+    def many(self, queryset, fields=None):
+        """
+        Function that serializes every row of a queryset, selecting only the given fields.
+        """
+
+        fields = fields or self.fields
+        return self.toRepresentation(queryset.values_list(*fields), fields)
+
+    @timedStage('serialization')
+    def one(self, queryset, fields=None):
+        """
+        Function that serializes the first row of a queryset, or returns None if it is empty.
+        """
+
+        fields = fields or self.fields
+        data = self.toRepresentation(queryset.values_list(*fields)[:1], fields)
+        return data[0] if data else None
+
+
+menuValues = ValuesReadSerializer(MenuSerializer)
+orderValues = ValuesReadSerializer(OrderSerializer)
+orderArchiveValues = ValuesReadSerializer(OrderArchiveSerializer)
+notificationValues = ValuesReadSerializer(NotificationSerializer)
+vendorValues = ValuesReadSerializer(VendorSerializer)
+customerValues = ValuesReadSerializer(CustomerSerializer)
@@ -0,0 +1,133 @@
+import re
+import threading
+from functools import wraps
+from time import perf_counter
+
+
+# Per-thread timings of the request being served, set by SlowRequestMiddleware
+
+requestState = threading.local()
+
+
+class RequestTimings():
+    def __init__(self):
+        """
+        Time spent by one request in each stage, in the database, and per SQL statement. Stage
+        times leave out the queries run during the stage, which are counted as database time.
+        """
+
+        self.stages = {}
+        self.dbTime = 0
+        self.queries = {}
+        self.activeStage = None
+        self.userType = None
+
+    def recordQuery(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper that times every statement of the request.
+        """
+
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            self.dbTime += duration
+            query = self.queries.get(sql)
+            if query:
+                query[0] += 1
+                query[1] += duration
+                query[2] = max(query[2], duration)
+            else:
+                self.queries[sql] = [1, duration, duration]
+
+
+def timedStage(name):
+    """
+    Decorator that adds the time spent in a function to the `name` stage of the current
+    request. Calls made while another stage is running are counted in that stage only.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            timings = getattr(requestState, 'timings', None)
+            if timings is None or timings.activeStage is not None:
+                return function(*args, **kwargs)
+
+            timings.activeStage = name
+            dbTime = timings.dbTime
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings.stages[name] = timings.stages.get(name, 0) + (
+                    perf_counter() - start - (timings.dbTime - dbTime))
+                timings.activeStage = None
+        return wrapper
+    return decorator
+
+
+def noteUserType(userType):
+    """
+    Function that records the type of the user making the current request.
+    """
+
+    timings = getattr(requestState, 'timings', None)
+    if timings is not None:
+        timings.userType = userType
+
+
+sqlLiteralPatterns = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),
+    (re.compile(r'\(\?\+\)(?:\s*,\s*\(\?\+\))+'), '(?+), ...'),
+    (re.compile(r'\s+'), ' ')
+]
+
+
+def fingerprint(sql):
+    """
+    Function that normalizes a SQL statement so statements differing only in their values,
+    or in the length of IN lists and multi-row VALUES, look the same.
+    """
+
+    for pattern, replacement in sqlLiteralPatterns:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def slowRequestRecord(request, response, timings, duration, threshold, topQueries):
+    """
+    Function that gives the log record of a slow request, with its stage timings and the
+    statements that took the most time, by fingerprint.
+    """
+
+    queries = {}
+    for sql, (count, total, longest) in timings.queries.items():
+        query = queries.setdefault(fingerprint(sql), [0, 0, 0])
+        query[0] += count
+        query[1] += total
+        query[2] = max(query[2], longest)
+
+    stages = dict(timings.stages, db=timings.dbTime)
+    stages['other'] = max(0, duration - sum(stages.values()))
+
+    match = request.resolver_match
+    return {
+        'route': match.route if match else None,
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'userType': timings.userType,
+        'durationMs': round(duration * 1000, 1),
+        'thresholdMs': threshold,
+        'stagesMs': {name: round(seconds * 1000, 1) for name, seconds in stages.items()},
+        'queryCount': sum(query[0] for query in queries.values()),
+        'queries': [{'fingerprint': sql, 'count': count, 'totalMs': round(total * 1000, 1),
+                     'maxMs': round(longest * 1000, 1)}
+                    for sql, (count, total, longest) in sorted(
+                        queries.items(), key=lambda item: item[1][1], reverse=True)[:topQueries]]
+    }
@@ -1,3 +1,661 @@
-from django.test import TestCase
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.apps import apps
+from django.db import connection, transaction
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from vgg_food_vendor_project.food_vendor_app.models import (
+    Auth,
+    Customer,
+    Menu,
+    MessageStatus,
+    Notification,
+    Order,
+    OrderArchive,
+    OrderItem,
+    OrderStatus,
+    RevokedToken,
+    ThrottleCounter,
+    Vendor
+)
+from vgg_food_vendor_project.food_vendor_app.deletion import scheduleAccountDeletion
+from vgg_food_vendor_project.food_vendor_app.ordercache import checkOrderCacheBackend
+from vgg_food_vendor_project.food_vendor_app.passwords import hashPassword
+from vgg_food_vendor_project.food_vendor_app.pricing import PriceIndex, bumpMenuVersion, priceIndex
+from vgg_food_vendor_project.food_vendor_app.revocation import RevocationList, revocationList
+from vgg_food_vendor_project.food_vendor_app.views import BulkAccountProvisioning, LoginAPIView
+
 
 # Create your tests here.
+class AppTestCase(TestCase):
+    password = 'Passw0rdX'
+
+    def setUp(self):
+        caches['orders'].clear()
+        OrderStatus.objects.create(id=1, name='pending')
+        OrderStatus.objects.create(id=2, name='processing')
+        OrderStatus.objects.create(id=3, name='completed')
+        MessageStatus.objects.create(name='unread')
+        MessageStatus.objects.create(name='read')
+        self.client = APIClient()
+
+    def signUp(self, userType, email, phoneNumber, **profile):
+        response = self.client.post('/api/{}/'.format(userType), {
+            'email': email, 'phoneNumber': phoneNumber, 'password': self.password, **profile}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def logIn(self, email):
+        response = self.client.post(
+            '/api/login/', {'email': email, 'password': self.password}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.client.cookies['FVA-USER'] = response['Set-Cookie'].split('FVA-USER=')[1].split(';')[0]
+
+
+class PriceIndexTest(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        priceIndex.clear()
+        self.vendor = self.signUp('vendor', 'vendor@fva.org', '08031234567', businessName='Mama Put')
+        self.signUp('customer', 'customer@fva.org', '08031234568', firstname='Ada', lastname='Obi')
+
+        self.logIn('vendor@fva.org')
+        response = self.client.post('/api/auth/vendor/menu/', {
+            'name': 'Jollof rice', 'price': 500, 'quantity': 10, 'unit': 'plate',
+            'isRecurring': True, 'frequencyOfReoccurrence': ['monday']}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.menu = response.json()
+
+    def order(self, *menuIds):
+        self.logIn('customer@fva.org')
+        return self.client.post('/api/auth/customer/order/', {
+            'vendorId': self.vendor['id'], 'itemsOrdered': list(menuIds)}, format='json')
+
+    def test_updated_price_is_charged_once_the_update_commits(self):
+        self.assertEqual(self.order(self.menu['id']).json()['amountDue'], 500)
+
+        self.logIn('vendor@fva.org')
+        response = self.client.put('/api/auth/vendor/menu/{}/'.format(self.menu['id']), {
+            'name': 'Jollof rice', 'price': 650, 'quantity': 10, 'unit': 'plate',
+            'isRecurring': True, 'frequencyOfReoccurrence': ['monday']}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertEqual(self.order(self.menu['id'], self.menu['id']).json()['amountDue'], 1300)
+
+    def test_update_from_another_process_is_seen(self):
+        self.order(self.menu['id'])
+
+        # Another process changes the price, this process's index is not told
+        with transaction.atomic():
+            Menu.objects.filter(id=self.menu['id']).update(price=800)
+            bumpMenuVersion(self.vendor['id'])
+
+        self.assertEqual(self.order(self.menu['id']).json()['amountDue'], 800)
+        self.assertEqual(list(Order.objects.values_list('amountDue', flat=True).order_by('id')), [500, 800])
+
+    def test_deleted_menu_cannot_be_ordered(self):
+        self.order(self.menu['id'])
+
+        self.logIn('vendor@fva.org')
+        self.client.delete('/api/auth/vendor/menu/{}/'.format(self.menu['id']))
+
+        self.assertEqual(self.order(self.menu['id']).status_code, 404)
+
+    def test_rolled_back_update_keeps_the_old_price(self):
+        self.order(self.menu['id'])
+
+        try:
+            with transaction.atomic():
+                Menu.objects.filter(id=self.menu['id']).update(price=800)
+                bumpMenuVersion(self.vendor['id'])
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertEqual(self.order(self.menu['id']).json()['amountDue'], 500)
+
+    def test_least_recently_used_vendor_is_evicted(self):
+        index = PriceIndex()
+        vendorIds = [self.vendor['id']] + [Vendor.objects.create(
+            businessName='Vendor {}'.format(i), email='v{}@fva.org'.format(i),
+            phoneNumber='0803000000{}'.format(i)).id for i in range(2)]
+
+        # Room for the vendor with a menu and one vendor without
+        maxBytes = PriceIndex.estimateSize({1: 1.0}) + PriceIndex.estimateSize({})
+
+        with override_settings(PRICE_INDEX_MAX_BYTES=maxBytes):
+            for vendorId in vendorIds:
+                index.prices(vendorId)
+            index.prices(vendorIds[0])
+
+        self.assertLessEqual(index.size, maxBytes)
+        self.assertEqual(list(index.vendors.keys()), [vendorIds[2], vendorIds[0]])
+        self.assertEqual(index.vendors[vendorIds[0]][1], {self.menu['id']: 500})
+
+
+class RevocationListTest(TestCase):
+    def setUp(self):
+        self.revocations = RevocationList()
+        self.revocations.refresh()
+
+    def revokeElsewhere(self, jti, createdAgo, **fields):
+        """
+        Revocation made by another process, created `createdAgo` before it commits.
+        """
+
+        token = RevokedToken.objects.create(jti=jti, expiresAt=timezone.now() + timedelta(hours=1), **fields)
+        RevokedToken.objects.filter(id=token.id).update(dateTimeCreated=timezone.now() - createdAgo)
+
+    def test_revocation_committed_after_later_ones_is_seen(self):
+        self.revokeElsewhere('later', timedelta(0), id=1001)
+        self.revocations.refresh()
+
+        # Created, and given its id, before the last refresh but committed after it
+        self.revokeElsewhere('earlier', timedelta(seconds=10), id=1000)
+        self.revocations.refresh()
+
+        self.assertTrue(self.revocations.isRevoked('later'))
+        self.assertTrue(self.revocations.isRevoked('earlier'))
+
+    def test_revocations_read_again_are_counted_once(self):
+        self.revokeElsewhere('once', timedelta(0))
+        for _ in range(3):
+            self.revocations.refresh()
+
+        self.assertEqual(self.revocations.bloomFilter.count, 1)
+
+
+@override_settings(TOKEN_REVOCATION_REFRESH_SECONDS=3600)
+class AccountsTestCase(AppTestCase):
+    """
+    A vendor and a customer with their logins, an admin client, and helpers that log in without
+    going through bcrypt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.passwordHash = hashPassword(cls.password)
+
+    def setUp(self):
+        super().setUp()
+        priceIndex.clear()
+        revocationList.refresh()
+
+        self.vendor = Vendor.objects.create(
+            businessName='Mama Put', email='vendor@fva.org', phoneNumber='+2348031234567')
+        self.customer = Customer.objects.create(
+            firstname='Ada', lastname='Obi', email='customer@fva.org', phoneNumber='+2348031234568')
+        self.vendorAuth = Auth.objects.create(email='vendor@fva.org', password=self.passwordHash,
+                                              userType='vendor', profileId=self.vendor.id)
+        self.customerAuth = Auth.objects.create(email='customer@fva.org', password=self.passwordHash,
+                                                userType='customer', profileId=self.customer.id)
+
+        self.admin = APIClient()
+        self.admin.force_authenticate(User.objects.create_superuser('admin', 'admin@fva.org', self.password))
+
+        self.unread = MessageStatus.objects.get(name='unread')
+        self.serial = 0
+
+    def nextSerial(self):
+        self.serial += 1
+        return self.serial
+
+    def logInAs(self, profile, userType):
+        self.client.cookies['FVA-USER'] = LoginAPIView().generateToken(
+            {'id': profile.id, 'email': profile.email}, userType)
+
+    def newMenu(self):
+        return Menu.objects.create(vendorId=self.vendor, name='Menu {}'.format(self.nextSerial()), price=500,
+                                   quantity=10, unit='plate', isRecurring=True, frequencyOfReoccurrence=['monday'])
+
+    def newOrder(self):
+        return Order.objects.create(customerId=self.customer, vendorId=self.vendor, itemsOrdered=[1],
+                                    amountDue=500, amountOutstanding=500, orderStatusId_id=1)
+
+    def newNotification(self):
+        return Notification.objects.create(subjectUser=self.customerAuth, orderId=self.newOrder(),
+                                           message='Your order is ready', messageStatusId=self.unread)
+
+    def newAccount(self):
+        serial = self.nextSerial()
+        return {'email': 'new{}@fva.org'.format(serial), 'phoneNumber': '0803{:07d}'.format(serial),
+                'password': self.password, 'businessName': 'Vendor', 'firstname': 'Ada', 'lastname': 'Obi'}
+
+
+class NotificationStatusTest(AccountsTestCase):
+    def test_vendor_only_marks_notifications_addressed_to_it(self):
+        sent = self.newNotification()
+        received = Notification.objects.create(subjectUser=self.vendorAuth, orderId=sent.orderId,
+                                               message='Order paid', messageStatusId=self.unread)
+
+        self.logInAs(self.vendor, 'vendor')
+        self.assertEqual(self.client.get('/api/auth/vendor/notification/unread-count/').json(), {'unread': 1})
+        response = self.client.patch('/api/auth/vendor/notification/status/', {'upTo': 10 ** 9}, format='json')
+
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(Notification.objects.get(id=sent.id).messageStatusId, self.unread)
+        self.assertNotEqual(Notification.objects.get(id=received.id).messageStatusId, self.unread)
+
+    def test_message_status_must_be_an_id(self):
+        self.logInAs(self.customer, 'customer')
+        response = self.client.patch('/api/auth/customer/notification/status/',
+                                     {'upTo': 10 ** 9, 'messageStatusId': 'abc'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+
+
+class QueryBudgetTest(AccountsTestCase):
+    """
+    Every route is requested once with a few rows of everything and once with many. The number of
+    queries must be the same both times and within the route's budget.
+    """
+
+    sizes = [2, 12]
+    seeded = 0
+
+    def seed(self, size):
+        """
+        Function that grows every kind of fixture to `size` rows.
+        """
+
+        count, self.seeded = size - self.seeded, size
+        # Fixtures are written behind the back of the cached customer orders
+        caches['orders'].clear()
+        now = timezone.now()
+
+        Vendor.objects.bulk_create([Vendor(
+            businessName='Vendor', email='seed{}@fva.org'.format(n), phoneNumber='+234800{:07d}'.format(n))
+            for n in [self.nextSerial() for _ in range(count)]])
+
+        menus = Menu.objects.bulk_create([Menu(
+            vendorId=self.vendor, name='Menu {}'.format(self.nextSerial()), price=500, quantity=10,
+            unit='plate', isRecurring=True, frequencyOfReoccurrence=['monday']) for _ in range(count)])
+
+        orders = Order.objects.bulk_create([Order(
+            customerId=self.customer, vendorId=self.vendor, itemsOrdered=[menu.id], amountDue=500,
+            amountOutstanding=500, orderStatusId_id=1, preOrderDateTime=now + timedelta(hours=6))
+            for menu in menus])
+        Order.objects.filter(id__in=[order.id for order in orders]).update(
+            dateAndTimeOfOrder=now - timedelta(hours=12))
+
+        OrderItem.objects.bulk_create([OrderItem(orderId=order, menuId_id=order.itemsOrdered[0], unitPrice=500)
+                                       for order in orders])
+        Notification.objects.bulk_create([Notification(
+            subjectUser=self.customerAuth, orderId=order, message='Your order is on its way',
+            messageStatusId=self.unread) for order in orders])
+        OrderArchive.objects.bulk_create([OrderArchive(
+            id=10 ** 6 + self.nextSerial(), customerId=self.customer, vendorId=self.vendor, itemsOrdered=[1],
+            amountDue=500, amountPaid=500, amountOutstanding=0, orderStatusId_id=3,
+            dateAndTimeOfOrder=now - timedelta(days=200)) for _ in range(count)])
+
+    def routes(self):
+        """
+        Requests of every route with their expected status and query budget. Each request
+        prepares what it needs before it returns the call to measure.
+        """
+
+        vendor, customer = self.vendor, self.customer
+        menuData = {'name': 'Menu', 'price': 600, 'quantity': 10, 'unit': 'plate',
+                    'isRecurring': True, 'frequencyOfReoccurrence': ['monday']}
+
+        def asVendor(call):
+            self.logInAs(vendor, 'vendor')
+            return call
+
+        def asCustomer(call):
+            self.logInAs(customer, 'customer')
+            return call
+
+        def newMenuData():
+            return {**menuData, 'name': 'Menu {}'.format(self.nextSerial())}
+
+        def deleteAccount():
+            profile = Customer.objects.create(firstname='Ada', lastname='Obi', email='gone{}@fva.org'.format(
+                self.nextSerial()), phoneNumber='+234801{:07d}'.format(self.serial))
+            return lambda: self.admin.delete('/api/auth/admin/customer/{}/'.format(profile.id))
+
+        def deletionProgress():
+            profile = Customer.objects.create(firstname='Ada', lastname='Obi', email='gone{}@fva.org'.format(
+                self.nextSerial()), phoneNumber='+234801{:07d}'.format(self.serial))
+            self.admin.delete('/api/auth/admin/customer/{}/'.format(profile.id))
+            return lambda: self.admin.get('/api/auth/admin/customer/{}/'.format(profile.id))
+
+        return [
+            # authentication
+            ('home', 200, 0, lambda: lambda: self.client.get('/api/')),
+            ('login', 200, 6, lambda: lambda: self.client.post(
+                '/api/login/', {'email': 'vendor@fva.org', 'password': self.password}, format='json')),
+            ('logout', 200, 4, lambda: asVendor(lambda: self.client.post('/api/auth/logout/'))),
+            ('vendors', 200, 1, lambda: lambda: self.client.get('/api/vendor/')),
+            ('vendor signup', 201, 11, lambda: (lambda account: lambda: self.client.post(
+                '/api/vendor/', account, format='json'))(self.newAccount())),
+            ('customer signup', 201, 11, lambda: (lambda account: lambda: self.client.post(
+                '/api/customer/', account, format='json'))(self.newAccount())),
+
+            # auth vendor
+            ('vendor menus', 200, 1, lambda: asVendor(lambda: self.client.get('/api/auth/vendor/menu/'))),
+            ('vendor create menu', 201, 6, lambda: (lambda data: asVendor(lambda: self.client.post(
+                '/api/auth/vendor/menu/', data, format='json')))(newMenuData())),
+            ('vendor menu', 200, 1, lambda: (lambda menu: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/menu/{}/'.format(menu.id))))(self.newMenu())),
+            ('vendor update menu', 200, 7, lambda: (lambda menu, data: asVendor(lambda: self.client.put(
+                '/api/auth/vendor/menu/{}/'.format(menu.id), data, format='json')))(self.newMenu(), newMenuData())),
+            ('vendor delete menu', 200, 5, lambda: (lambda menu: asVendor(lambda: self.client.delete(
+                '/api/auth/vendor/menu/{}/'.format(menu.id))))(self.newMenu())),
+            ('vendor orders', 200, 1, lambda: asVendor(lambda: self.client.get('/api/auth/vendor/order/'))),
+            ('vendor order feed', 200, 1, lambda: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/order/?status=1&outstanding=true&sort=preOrderDateTime'))),
+            ('vendor archived orders', 200, 1, lambda: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/order/archive/'))),
+            ('vendor order', 200, 1, lambda: (lambda order: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/order/{}/'.format(order.id))))(self.newOrder())),
+            ('vendor update order status', 200, 5, lambda: (lambda order: asVendor(lambda: self.client.patch(
+                '/api/auth/vendor/order/{}/'.format(order.id), {'orderStatus': 2}, format='json')))(self.newOrder())),
+            ('vendor bulk order status', 200, 8, lambda: (lambda orders: asVendor(lambda: self.client.patch(
+                '/api/auth/vendor/order/status/', {'ids': [order.id for order in orders], 'orderStatus': 2},
+                format='json')))([self.newOrder() for _ in range(self.seeded)])),
+            ('vendor sales', 200, 1, lambda: asVendor(lambda: self.client.get('/api/auth/vendor/sales/daily/'))),
+            ('vendor notifications', 200, 2, lambda: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/notification/'))),
+            ('vendor notify customer', 201, 7, lambda: (lambda order: asVendor(lambda: self.client.post(
+                '/api/auth/vendor/notification/', {'subjectUser': customer.id, 'orderId': order.id,
+                                                   'message': 'Your order is ready', 'messageStatusId': self.unread.id},
+                format='json')))(self.newOrder())),
+            ('vendor broadcast', 201, 5, lambda: asVendor(lambda: self.client.post(
+                '/api/auth/vendor/notification/broadcast/', {'message': 'We close early today'}, format='json'))),
+            ('vendor notification', 200, 2, lambda: (lambda notification: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/notification/{}/'.format(notification.id))))(self.newNotification())),
+            ('vendor notification status', 200, 2, lambda: asVendor(lambda: self.client.patch(
+                '/api/auth/vendor/notification/status/', {'upTo': 10 ** 9}, format='json'))),
+            ('vendor unread count', 200, 1, lambda: asVendor(lambda: self.client.get(
+                '/api/auth/vendor/notification/unread-count/'))),
+
+            # public
+            ('menus', 200, 1, lambda: lambda: self.client.get('/api/menu/')),
+            ('menu changes', 200, 3, lambda: lambda: self.client.get('/api/menu/changes/?since=1')),
+            ('menus of a vendor', 200, 1, lambda: lambda: self.client.get('/api/vendor/{}/menu/'.format(vendor.id))),
+            ('menu', 200, 1, lambda: (lambda menu: lambda: self.client.get(
+                '/api/menu/{}/'.format(menu.id)))(self.newMenu())),
+
+            # auth customer
+            ('customer orders', 200, 1, lambda: asCustomer(lambda: self.client.get('/api/auth/customer/order/'))),
+            ('customer create order', 201, 10, lambda: (lambda menu: asCustomer(lambda: self.client.post(
+                '/api/auth/customer/order/', {'vendorId': vendor.id, 'itemsOrdered': [menu.id, menu.id]},
+                format='json')))(self.newMenu())),
+            ('customer archived orders', 200, 1, lambda: asCustomer(lambda: self.client.get(
+                '/api/auth/customer/order/archive/'))),
+            ('customer order', 200, 1, lambda: (lambda order: asCustomer(lambda: self.client.get(
+                '/api/auth/customer/order/{}/'.format(order.id))))(self.newOrder())),
+            ('customer cancel order', 204, 5, lambda: (lambda order: asCustomer(lambda: self.client.delete(
+                '/api/auth/customer/order/{}/'.format(order.id))))(self.newOrder())),
+            ('customer pay order', 200, 3, lambda: (lambda order: asCustomer(lambda: self.client.patch(
+                '/api/auth/customer/order/payment/{}/'.format(order.id), {'amountPaid': 100},
+                format='json')))(self.newOrder())),
+            ('customer notifications', 200, 2, lambda: asCustomer(lambda: self.client.get(
+                '/api/auth/customer/notification/'))),
+            ('customer notification', 200, 2, lambda: (lambda notification: asCustomer(lambda: self.client.get(
+                '/api/auth/customer/notification/{}/'.format(notification.id))))(self.newNotification())),
+            ('customer notification status', 200, 2, lambda: asCustomer(lambda: self.client.patch(
+                '/api/auth/customer/notification/status/', {'upTo': 10 ** 9}, format='json'))),
+            ('customer unread count', 200, 1, lambda: asCustomer(lambda: self.client.get(
+                '/api/auth/customer/notification/unread-count/'))),
+
+            # admin
+            ('admin revoke token', 200, 4, lambda: (lambda jti: lambda: self.admin.post(
+                '/api/auth/admin/token/revoke/', {'jti': jti}, format='json'))('jti{}'.format(self.nextSerial()))),
+            ('admin bulk customers', 201, 7, lambda: (lambda account: lambda: self.admin.post(
+                '/api/auth/admin/customer/bulk/', [account], format='json'))(self.newAccount())),
+            ('admin delete account', 202, 12, lambda: deleteAccount()),
+            ('admin deletion progress', 200, 1, lambda: deletionProgress()),
+            ('admin memory', 409, 0, lambda: lambda: self.admin.get('/api/auth/admin/memory/')),
+            ('admin order cache', 200, 0, lambda: lambda: self.admin.get('/api/auth/admin/cache/orders/')),
+        ]
+
+    def test_query_counts_do_not_grow_with_data(self):
+        queries = {}
+
+        for size in self.sizes:
+            self.seed(size)
+            for name, expectedStatus, budget, prepare in self.routes():
+                request = prepare()
+                with CaptureQueriesContext(connection) as captured:
+                    response = request()
+                self.assertEqual(response.status_code, expectedStatus,
+                                 '{} with {} rows: {}'.format(name, size, response.content))
+                queries.setdefault(name, []).append([query['sql'] for query in captured.captured_queries])
+
+        for name, expectedStatus, budget, prepare in self.routes():
+            small, large = queries[name]
+            with self.subTest(route=name):
+                if len(small) != len(large) or len(large) > budget:
+                    self.fail('{}: {} queries with {} rows and {} with {}, the budget is {}\n{}'.format(
+                        name, len(small), self.sizes[0], len(large), self.sizes[-1], budget,
+                        '\n'.join(large)))
+
+
+class OrderArchiveTest(AccountsTestCase):
+    def test_archived_orders_keep_their_lines_and_notifications(self):
+        notification = self.newNotification()
+        order = notification.orderId
+        OrderItem.objects.create(orderId=order, menuId=self.newMenu(), quantity=2, unitPrice=250)
+        Order.objects.filter(id=order.id).update(orderStatusId_id=3, amountPaid=500, amountOutstanding=0,
+                                                 dateAndTimeOfOrder=timezone.now() - timedelta(days=400))
+
+        call_command('archiveorders', pause=0, stdout=StringIO())
+
+        self.assertFalse(Order.objects.filter(id=order.id).exists())
+        self.assertFalse(OrderItem.objects.filter(orderId=order.id).exists())
+        self.assertEqual([(item['quantity'], item['unitPrice']) for item in OrderArchive.objects.get(
+            id=order.id).orderItems], [(2, 250)])
+        self.assertTrue(Notification.objects.filter(id=notification.id).exists())
+
+    def test_out_of_range_dates_are_rejected(self):
+        self.logInAs(self.customer, 'customer')
+        response = self.client.get('/api/auth/customer/order/archive/?from=2020-13-01T00:00')
+
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderFeedTest(AccountsTestCase):
+    def test_pages_continue_after_the_last_order_changes_status(self):
+        orders = [self.newOrder() for _ in range(3)]
+        self.logInAs(self.vendor, 'vendor')
+
+        first = self.client.get('/api/auth/vendor/order/?status=1&limit=2&fields=id')
+        Order.objects.filter(id=first.json()[-1]['id']).update(orderStatusId_id=2, amountOutstanding=0)
+        second = self.client.get('/api/auth/vendor/order/?status=1&limit=2&fields=id&after={}'.format(
+            first['X-FVA-After']))
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual([order['id'] for order in first.json() + second.json()],
+                         [order.id for order in reversed(orders)])
+        self.assertNotIn('X-FVA-After', second)
+
+    def test_out_of_range_dates_are_rejected(self):
+        self.logInAs(self.vendor, 'vendor')
+        response = self.client.get('/api/auth/vendor/order/?to=2020-13-01T00:00')
+
+        self.assertEqual(response.status_code, 400)
+
+
+class ThrottleTest(AccountsTestCase):
+    # A fixed time early in a window, so the attempts of a test are all counted in it
+    now = 60 * 29000000 + 1
+
+    def logInWithWrongPassword(self, **headers):
+        return self.client.post('/api/login/', {'email': 'vendor@fva.org', 'password': 'wrong'},
+                                format='json', **headers)
+
+    def test_login_attempts_of_an_email_are_counted_until_the_limit(self):
+        with patch('vgg_food_vendor_project.food_vendor_app.throttling.time', return_value=self.now):
+            statuses = [self.logInWithWrongPassword().status_code for _ in range(11)]
+
+        self.assertNotIn(429, statuses[:10])
+        self.assertEqual(statuses[10], 429)
+        self.assertEqual(ThrottleCounter.objects.get(key__startswith='throttle:login_email:').count, 10)
+
+    def test_addresses_forwarded_before_the_router_are_ignored(self):
+        with patch('vgg_food_vendor_project.food_vendor_app.throttling.time', return_value=self.now):
+            for forged in ['198.51.100.1', '198.51.100.2']:
+                self.logInWithWrongPassword(HTTP_X_FORWARDED_FOR='{}, 203.0.113.7'.format(forged))
+
+        self.assertEqual(ThrottleCounter.objects.get(key__startswith='throttle:login_ip:').key,
+                         'throttle:login_ip:ip:203.0.113.7:{}'.format(self.now // 60))
+        self.assertEqual(ThrottleCounter.objects.get(key__startswith='throttle:login_ip:').count, 2)
+
+
+class OrderCacheBackendTest(TestCase):
+    def test_caches_of_one_dyno_are_refused(self):
+        for backend in ['locmem.LocMemCache', 'filebased.FileBasedCache', 'db.DatabaseCache']:
+            with self.subTest(backend=backend), override_settings(CACHES={'orders': {
+                    'BACKEND': 'django.core.cache.backends.' + backend}}):
+                self.assertRaises(ImproperlyConfigured, checkOrderCacheBackend)
+
+    def test_memcached_is_accepted(self):
+        with override_settings(CACHES={'orders': {
+                'BACKEND': 'django.core.cache.backends.memcached.PyLibMCCache'}}):
+            checkOrderCacheBackend()
+
+
+class AccountDeletionTest(AccountsTestCase):
+    def test_vendor_scheduled_for_deletion_is_hidden_and_cannot_be_ordered_from(self):
+        menu = self.newMenu()
+        priceIndex.prices(self.vendor.id)
+        scheduleAccountDeletion('vendor', self.vendor.id)
+
+        self.assertEqual(self.client.get('/api/vendor/').json(), [])
+        self.assertEqual(self.client.get('/api/menu/').json(), [])
+        self.assertEqual(self.client.get('/api/vendor/{}/menu/'.format(self.vendor.id)).json(), [])
+
+        self.logInAs(self.customer, 'customer')
+        response = self.client.post('/api/auth/customer/order/', {
+            'vendorId': self.vendor.id, 'itemsOrdered': [menu.id]}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_synced_clients_drop_the_menus_of_a_vendor_scheduled_for_deletion(self):
+        menu = self.newMenu()
+        since = self.client.get('/api/menu/changes/').json()['since']
+        scheduleAccountDeletion('vendor', self.vendor.id)
+
+        changes = self.client.get('/api/menu/changes/?since={}'.format(since)).json()
+        self.assertEqual((changes['menus'], changes['deleted']), ([], [menu.id]))
+        self.assertEqual(self.client.get('/api/menu/changes/').json()['menus'], [])
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_admin_delete_confirmation_lists_only_the_account(self):
+        self.newNotification()
+        admin = Client()
+        admin.force_login(User.objects.get(username='admin'))
+
+        response = admin.get('/admin/food_vendor_app/vendor/{}/delete/'.format(self.vendor.id))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['deleted_objects'], [str(self.vendor)])
+
+
+class MenuDeletionTest(AccountsTestCase):
+    def test_lines_of_past_orders_outlive_their_menu(self):
+        menu = self.newMenu()
+        self.logInAs(self.customer, 'customer')
+        order = self.client.post('/api/auth/customer/order/', {
+            'vendorId': self.vendor.id, 'itemsOrdered': [menu.id, menu.id]}, format='json').json()
+
+        self.logInAs(self.vendor, 'vendor')
+        self.assertEqual(self.client.delete('/api/auth/vendor/menu/{}/'.format(menu.id)).status_code, 200)
+
+        self.assertEqual(list(OrderItem.objects.filter(orderId=order['id']).values_list(
+            'menuId', 'quantity', 'unitPrice')), [(menu.id, 2, 500)])
+
+
+class AuthBackfillTest(TestCase):
+    migrations = 'vgg_food_vendor_project.food_vendor_app.migrations.'
+
+    def setUp(self):
+        self.vendor = Vendor.objects.create(businessName='Mama Put', email='both@fva.org', phoneNumber='+2348031234567')
+        self.customer = Customer.objects.create(firstname='Ada', lastname='Obi', email='both@fva.org',
+                                                phoneNumber='+2348031234568')
+
+    def assertLogsInAsVendor(self):
+        self.assertEqual(Auth.objects.values_list('userType', 'profileId').get(), ('vendor', self.vendor.id))
+
+    def test_email_of_a_vendor_and_a_customer_stays_a_vendor(self):
+        Auth.objects.create(email='both@fva.org', password='x')
+
+        with connection.schema_editor() as schemaEditor:
+            import_module(self.migrations + '0007_backfill_auth_usertype').backfillAuthUserType(apps, schemaEditor)
+
+        self.assertLogsInAsVendor()
+
+    def test_emails_backfilled_as_customers_go_back_to_vendors(self):
+        Auth.objects.create(email='both@fva.org', password='x', userType='customer', profileId=self.customer.id)
+
+        with connection.schema_editor() as schemaEditor:
+            import_module(self.migrations + '0020_auth_vendor_precedence').restoreVendorPrecedence(apps, schemaEditor)
+
+        self.assertLogsInAsVendor()
+
+
+class BulkAccountProvisioningTest(AccountsTestCase):
+    def test_email_signed_up_after_validation_is_a_conflict(self):
+        account = self.newAccount()
+        provisioning = BulkAccountProvisioning('customer', [account])
+        Auth.objects.create(email=account['email'], password=self.passwordHash, userType='vendor')
+
+        self.assertIsNone(provisioning.save())
+        self.assertEqual(provisioning.errors, [{'index': 0, 'email': account['email'],
+                                                'errors': ['Email is already signed up']}])
+        self.assertFalse(Customer.objects.filter(email=account['email']).exists())
+
+    @override_settings(PROVISIONING_API_LIMIT=1)
+    def test_lists_over_the_limit_are_refused(self):
+        response = self.admin.post('/api/auth/admin/customer/bulk/', [self.newAccount(), self.newAccount()],
+                                   format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Customer.objects.filter(email__startswith='new').exists())
+
+
+class MenuChangesTest(TransactionTestCase):
+    """
+    Every write commits on its own, as the sync tokens are transaction ids.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.vendor = Vendor.objects.create(
+            businessName='Mama Put', email='vendor@fva.org', phoneNumber='+2348031234567')
+        self.menus = [Menu.objects.create(vendorId=self.vendor, name='Menu {}'.format(n), price=500, quantity=10,
+                                          unit='plate', isRecurring=True, frequencyOfReoccurrence=['monday'])
+                      for n in range(2)]
+
+    def sync(self, since=None):
+        return self.client.get('/api/menu/changes/', {'since': since} if since else {}).json()
+
+    def test_menu_updated_after_a_sync_comes_in_the_next(self):
+        since = self.sync()['since']
+        Menu.objects.filter(id=self.menus[0].id).update(price=650)
+
+        changes = self.sync(since)
+
+        self.assertEqual([(menu['id'], menu['price']) for menu in changes['menus']], [(self.menus[0].id, 650)])
+        self.assertEqual(changes['deleted'], [])
+
+    def test_deleted_menu_comes_as_deleted(self):
+        menuId = self.menus[1].id
+        since = self.sync()['since']
+        self.menus[1].delete()
+
+        changes = self.sync(since)
+
+        self.assertEqual((changes['menus'], changes['deleted']), ([], [menuId]))
+
+    def test_since_must_be_a_token(self):
+        self.assertEqual(self.client.get('/api/menu/changes/?since=yesterday').status_code, 400)
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from hashlib import blake2b
+from time import time
+from django.db import connections, router
+from rest_framework.throttling import SimpleRateThrottle
+from vgg_food_vendor_project.food_vendor_app.models import ThrottleCounter
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Rate throttle using a sliding window estimated from two fixed window counters. The counters
+    are ThrottleCounter rows on the primary database, shared by every worker of every host and
+    incremented in a single statement, so concurrent requests are all counted and no counter is
+    evicted before it expires. Only the methods in `throttledMethods` are throttled, so listing
+    a resource is never slowed down by signups.
+    """
+
+    throttledMethods = ('POST',)
+
+    def counterKey(self, window):
+        return '{}:{}'.format(self.key, window)
+
+    @staticmethod
+    def counters():
+        return ThrottleCounter.objects.using(router.db_for_write(ThrottleCounter))
+
+    def increment(self, window):
+        """
+        Function that adds one to the counter of a window, creating it if needed.
+        """
+
+        expiresAt = datetime.fromtimestamp((window + 2) * self.duration, timezone.utc)
+        with connections[router.db_for_write(ThrottleCounter)].cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {0} ("key", "count", "expiresAt") VALUES (%s, 1, %s) '
+                'ON CONFLICT ("key") DO UPDATE SET "count" = {0}."count" + 1'.format(
+                    ThrottleCounter._meta.db_table), [self.counterKey(window), expiresAt])
+
+    def allow_request(self, request, view):
+        if request.method not in self.throttledMethods or self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = time()
+        window = int(self.now // self.duration)
+        elapsed = (self.now - window * self.duration) / self.duration
+
+        counts = dict(self.counters().filter(
+            key__in=[self.counterKey(window), self.counterKey(window - 1)]).values_list('key', 'count'))
+        self.currentCount = counts.get(self.counterKey(window), 0)
+        self.previousCount = counts.get(self.counterKey(window - 1), 0)
+        self.elapsed = elapsed
+
+        if self.previousCount * (1 - elapsed) + self.currentCount >= self.num_requests:
+            return False
+
+        self.increment(window)
+        return True
+
+    def wait(self):
+        """
+        Seconds until the estimated request count drops under the limit.
+        """
+
+        if self.currentCount >= self.num_requests or self.previousCount == 0:
+            return (1 - self.elapsed) * self.duration
+
+        freeFraction = 1 - (self.num_requests - self.currentCount) / self.previousCount
+        return max(0, freeFraction - self.elapsed) * self.duration
+
+
+class IPThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        return 'throttle:{}:ip:{}'.format(self.scope, self.get_ident(request))
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email:
+            return None
+        emailDigest = blake2b(email.strip().lower().encode('utf-8'), digest_size=16).hexdigest()
+        return 'throttle:{}:email:{}'.format(self.scope, emailDigest)
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = 'login_email'
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignupEmailThrottle(EmailThrottle):
+    scope = 'signup_email'
@@ -9,6 +9,9 @@ urlpatterns = [
     # user login
     path('login/', views.LoginAPIView.as_view()),
 
+    # user logout
+    path('auth/logout/', views.LogoutAPIView.as_view()),
+
 
     # user authentication and vendor view
 
@@ -33,6 +36,14 @@ urlpatterns = [
     # vendor view all orders on GET
     path('auth/vendor/order/', views.AuthVendorOrderAPIView.as_view()),
 
+    # vendor view archived orders on GET
+    path('auth/vendor/order/archive/',
+         views.AuthVendorOrderArchiveAPIView.as_view()),
+
+    # vendor update the status of many orders on PATCH
+    path('auth/vendor/order/status/',
+         views.AuthVendorOrderStatusAPIView.as_view()),
+
     # vendor view order, update order status on PATCH
     path('auth/vendor/order/<int:order_id>/',
          views.AuthVendorOrderDetailAPIView.as_view()),
@@ -48,6 +59,18 @@ urlpatterns = [
     path('auth/vendor/notification/<int:notification_id>/',
          views.VendorNotificationDetailAPIView.as_view()),
 
+    # vendor mark many notifications on PATCH
+    path('auth/vendor/notification/status/',
+         views.VendorNotificationStatusAPIView.as_view()),
+
+    # vendor notify every customer with an open order on POST
+    path('auth/vendor/notification/broadcast/',
+         views.VendorNotificationBroadcastAPIView.as_view()),
+
+    # vendor count unread notifications
+    path('auth/vendor/notification/unread-count/',
+         views.VendorNotificationUnreadCountAPIView.as_view()),
+
 
     # public
 
@@ -55,6 +78,9 @@ urlpatterns = [
     # view all menus
     path('menu/', views.MenuAPIView.as_view()),
 
+    # get menus changed since a previous sync
+    path('menu/changes/', views.MenuChangesAPIView.as_view()),
+
     # view all menus of a vendor
     path('vendor/<int:vendor_id>/menu/', views.VendorMenuAPIView.as_view()),
 
@@ -68,6 +94,10 @@ urlpatterns = [
     # customer view all orders on GET, make order on POST
     path('auth/customer/order/', views.AuthCustomerOrderAPIView.as_view()),
 
+    # customer view archived orders on GET
+    path('auth/customer/order/archive/',
+         views.AuthCustomerOrderArchiveAPIView.as_view()),
+
     # customer view order on GET, cancel order on DELETE
     path('auth/customer/order/<int:order_id>/',
          views.AuthCustomerOrderDetailAPIView.as_view()),
@@ -83,4 +113,33 @@ urlpatterns = [
     # customer view a notification
     path('auth/customer/notification/<int:notification_id>/',
          views.CustomerNotificationDetailAPIView.as_view()),
+
+    # customer mark many notifications on PATCH
+    path('auth/customer/notification/status/',
+         views.CustomerNotificationStatusAPIView.as_view()),
+
+    # customer count unread notifications
+    path('auth/customer/notification/unread-count/',
+         views.CustomerNotificationUnreadCountAPIView.as_view()),
+
+
+    # admin
+
+
+    # admin revoke user tokens on POST
+    path('auth/admin/token/revoke/', views.AdminRevokeTokenAPIView.as_view()),
+
+    # admin view the worker's memory growth on GET, start tracing on POST, stop tracing on DELETE
+    path('auth/admin/memory/', views.AdminMemoryAPIView.as_view()),
+
+    # admin view the worker's customer order cache metrics on GET
+    path('auth/admin/cache/orders/', views.AdminOrderCacheAPIView.as_view()),
+
+    # admin sign up many vendors or customers on POST
+    path('auth/admin/<str:user_type>/bulk/',
+         views.AdminBulkAccountAPIView.as_view()),
+
+    # admin delete a vendor or customer on DELETE, view the deletion progress on GET
+    path('auth/admin/<str:user_type>/<int:profile_id>/',
+         views.AdminAccountDeletionAPIView.as_view()),
 ]
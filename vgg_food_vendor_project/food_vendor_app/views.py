@@ -1,39 +1,67 @@
+import json
 from os import getenv
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import Counter
+from itertools import islice
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.utils.dateparse import parse_datetime
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from rest_framework_jwt.settings import api_settings
-from datetime import datetime, timedelta
-import pytz
-import bcrypt
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 import re as regex
-from phonenumbers import (
-    parse as phoneparse,
-    is_valid_number,
-    format_number as format_phone,
-    PhoneNumberFormat,
+from vgg_food_vendor_project.food_vendor_app.deletion import accountTokenId, scheduleAccountDeletion
+from vgg_food_vendor_project.food_vendor_app.memory import memoryTracker
+from vgg_food_vendor_project.food_vendor_app.ordercache import customerOrderCache
+from vgg_food_vendor_project.food_vendor_app.pricing import bumpMenuVersion, priceIndex
+from vgg_food_vendor_project.food_vendor_app.passwords import hashPassword, hashPasswords
+from vgg_food_vendor_project.food_vendor_app.revocation import revocationList
+from vgg_food_vendor_project.food_vendor_app.slowrequests import noteUserType, timedStage
+from vgg_food_vendor_project.food_vendor_app.throttling import (
+    LoginEmailThrottle,
+    LoginIPThrottle,
+    SignupEmailThrottle,
+    SignupIPThrottle
 )
 from vgg_food_vendor_project.food_vendor_app.models import (
+    AccountDeletion,
     Auth,
     Customer,
     Menu,
+    MenuTombstone,
     MessageStatus,
     Notification,
     Order,
+    OrderArchive,
+    OrderItem,
     OrderStatus,
     Vendor
 )
 from vgg_food_vendor_project.food_vendor_app.serializers import (
+    AccountDeletionSerializer,
     AuthSerializer,
     CustomerSerializer,
     MenuSerializer,
     MessageStatusSerializer,
     NotificationSerializer,
+    OrderArchiveSerializer,
     OrderSerializer,
     Order_OrderStatusSerializer,
     OrderStatusSerializer,
-    VendorSerializer
+    VendorSerializer,
+    customerValues,
+    menuValues,
+    notificationValues,
+    orderArchiveValues,
+    orderValues,
+    sparseFields,
+    vendorValues
 )
 
 
@@ -140,25 +168,217 @@ class SanitizePassword():
         '''
         Function to hash valid user password.
         '''
-        encodedPassword = self.password.encode('utf-8')
-        print('\n', encodedPassword, '\n')
-        return bcrypt.hashpw(
-            encodedPassword, bcrypt.gensalt()).decode('utf-8')
+        return hashPassword(self.password)
 
 
-def getDataById(relationalModel, relationId, modelSerializer):
+# phonenumbers is only needed on signup and its import is slow, so it is loaded on first use
+# with the metadata of the one region we serve
+
+phoneRegion = 'NG'
+phoneNumbersModule = None
+
+
+def loadPhoneNumbers():
+    """
+    Function that imports phonenumbers once and preloads the metadata of phoneRegion.
+    """
+
+    global phoneNumbersModule
+
+    if phoneNumbersModule is None:
+        import phonenumbers
+        phonenumbers.PhoneMetadata.metadata_for_region(phoneRegion)
+        phoneNumbersModule = phonenumbers
+    return phoneNumbersModule
+
+
+def formatPhoneNumber(phoneNumber):
+    """
+    Function that returns a valid Nigerian phone number in E.164 format, or None if it is invalid.
+    """
+
+    phonenumbers = loadPhoneNumbers()
+
+    try:
+        phone = phonenumbers.parse(phoneNumber, phoneRegion)
+    except phonenumbers.NumberParseException:
+        return None
+
+    if not phonenumbers.is_valid_number(phone):
+        return None
+    return phonenumbers.format_number(phone, phonenumbers.PhoneNumberFormat.E164)
+
+
+class BulkAccountProvisioning():
+    profileModels = {'vendor': Vendor, 'customer': Customer}
+    profileSerializers = {'vendor': VendorSerializer,
+                          'customer': CustomerSerializer}
+    requiredFields = {'vendor': ['businessName', 'email', 'phoneNumber', 'password'],
+                      'customer': ['firstname', 'lastname', 'email', 'phoneNumber', 'password']}
+
+    def __init__(self, userType, records):
+        """
+        Function that validates many vendor or customer signups at once. Every record is checked
+        the way the signup views check it, and `self.errors` lists the problems of each bad record.
+        """
+
+        self.userType = userType
+        self.ProfileModel = self.profileModels[userType]
+        self.records = []
+        self.errors = []
+
+        if not isinstance(records, list):
+            self.errors.append({'index': None, 'errors': [
+                               'A list of {} records is required'.format(userType)]})
+            return
+
+        for index, record in enumerate(records):
+            recordErrors = self.validateRecord(record)
+            if recordErrors:
+                self.errors.append({'index': index, 'email': record.get('email') if isinstance(record, dict) else None,
+                                    'errors': recordErrors})
+            else:
+                self.records.append((index, record))
+
+        self.checkUniqueness()
+
+    def validateRecord(self, record):
+        if not isinstance(record, dict):
+            return ['Record must be an object']
+
+        fields = self.requiredFields[self.userType]
+
+        missingFields = [k for k in fields if k not in record.keys()]
+        if missingFields:
+            return ['Required fields missing: {}'.format(', '.join(missingFields))]
+
+        for k in fields:
+            if not isinstance(record[k], str):
+                return ['{} must be a string'.format(k)]
+
+        recordErrors = []
+
+        for k in fields:
+            if k in ['email', 'phoneNumber', 'password']:
+                continue
+            maxLength = self.ProfileModel._meta.get_field(k).max_length
+            if len(record[k]) == 0 or len(record[k]) > maxLength:
+                recordErrors.append(
+                    '{} must have between 1 and {} characters'.format(k, maxLength))
+
+        emailFormat = '^[a-z0-9]+[\._]?[a-za-z0-9]+[@]\w+[.]\w{2,3}$'
+        if not regex.search(emailFormat, record['email']):
+            recordErrors.append('Invalid email')
+
+        record['phoneNumber'] = formatPhoneNumber(record['phoneNumber'])
+        if record['phoneNumber'] is None:
+            recordErrors.append('Phone number must be valid Nigerian number')
+
+        validPassword = SanitizePassword(record['password'])
+        if hasattr(validPassword, 'error'):
+            recordErrors.append(validPassword.error['message'])
+
+        return recordErrors
+
+    def checkUniqueness(self):
+        """
+        Function that rejects emails and phone numbers repeated in the batch or already signed up,
+        with one query per table.
+        """
+
+        emails = [record['email'] for index, record in self.records]
+        phoneNumbers = [record['phoneNumber']
+                        for index, record in self.records]
+
+        takenEmails = set(Auth.objects.filter(
+            email__in=emails).values_list('email', flat=True))
+        takenEmails.update(self.ProfileModel.objects.filter(
+            email__in=emails).values_list('email', flat=True))
+        takenPhoneNumbers = set(self.ProfileModel.objects.filter(
+            phoneNumber__in=phoneNumbers).values_list('phoneNumber', flat=True))
+
+        seenEmails = set()
+        seenPhoneNumbers = set()
+        uniqueRecords = []
+
+        for index, record in self.records:
+            recordErrors = []
+            if record['email'] in takenEmails or record['email'] in seenEmails:
+                recordErrors.append('Email is already signed up')
+            if record['phoneNumber'] in takenPhoneNumbers or record['phoneNumber'] in seenPhoneNumbers:
+                recordErrors.append('Phone number is already signed up')
+            seenEmails.add(record['email'])
+            seenPhoneNumbers.add(record['phoneNumber'])
+
+            if recordErrors:
+                self.errors.append(
+                    {'index': index, 'email': record['email'], 'errors': recordErrors})
+            else:
+                uniqueRecords.append((index, record))
+
+        self.records = uniqueRecords
+        self.errors.sort(key=lambda e: -1 if e['index'] is None else e['index'])
+
+    def save(self, workers=1):
+        """
+        Function that hashes every password, across a pool of `workers` processes if there is more
+        than one, and creates all Auth and profile rows in one transaction. Returns the serialized
+        profiles, or None with `self.errors` set if a signup made meanwhile took an email or phone
+        number of the batch.
+        """
+
+        records = [record for index, record in self.records]
+        hashedPasswords = hashPasswords([record['password'] for record in records], workers)
+
+        profileFields = [k for k in self.requiredFields[self.userType]
+                         if k != 'password']
+
+        try:
+            with transaction.atomic():
+                profiles = self.ProfileModel.objects.bulk_create([
+                    self.ProfileModel(**{k: record[k] for k in profileFields}) for record in records])
+                Auth.objects.bulk_create([Auth(email=record['email'], password=hashedPassword,
+                                               userType=self.userType, profileId=profile.id)
+                                          for record, hashedPassword, profile in zip(records, hashedPasswords, profiles)])
+        except IntegrityError:
+            self.checkUniqueness()
+            return None
+
+        return self.profileSerializers[self.userType](profiles, many=True).data
+
+
+class SparseFields():
+    def __init__(self, request, modelSerializer):
+        """
+        Fields of a serializer picked with the `fields=` or `exclude=` query parameters.
+        """
+
+        try:
+            self.fields = sparseFields(request.query_params, modelSerializer.Meta.fields)
+        except ValueError as unknown:
+            self.error = {'message': 'Unknown fields: {}'.format(', '.join(unknown.args[0])),
+                          'status': status.HTTP_400_BAD_REQUEST}
+
+    def errorResponse(self):
+        return Response({'message': self.error['message']
+                         }, status=self.error['status'])
+
+
+def getDataById(relationalModel, relationId, modelSerializer, fields=None):
     """
-    Function that gets data by id.
+    Function that gets data by id, loading and showing only the given fields if there are some.
     """
 
     try:
-        relationObject = relationalModel.objects.get(id=relationId)
+        relationObject = relationalModel.objects.only(
+            *(fields or modelSerializer.Meta.fields)).get(id=relationId)
     except relationalModel.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
-    return Response(modelSerializer(relationObject).data)
+    return Response(modelSerializer(relationObject, fields=fields).data)
 
 
 class UserAuthProcess():
+    @timedStage('auth')
     def __init__(self, request, userType):
         """
         Function that handles both authentication and authorization of users.
@@ -183,11 +403,19 @@ class UserAuthProcess():
         for k, v in userPayload.items():
             if type(v) == list:
                 userPayload[k] = v[0]
+        noteUserType(userPayload['username'])
 
         if userPayload['username'] != userType:
             self.error = {'message': 'Only {}s are allowed'.format(userType),
                           'status': status.HTTP_403_FORBIDDEN}
 
+        # Reject revoked tokens
+
+        if revocationList.isRevoked(userPayload.get('jti')) or revocationList.isRevoked(
+                accountTokenId(userPayload['username'], userPayload.get('user_id'))):
+            self.error = {'message': 'Log on to {}login to login'.format(app_base_route),
+                          'status': status.HTTP_401_UNAUTHORIZED}
+
         self.userPayload = userPayload
 
     def errorResponse(self):
@@ -198,6 +426,366 @@ class UserAuthProcess():
                          }, status=self.error['status'])
 
 
+def addressedNotifications(userType, profileId):
+    """
+    Function that gets the notifications addressed to a vendor or customer. Notifications point
+    at the login (Auth) of the user they are addressed to.
+    """
+
+    return Notification.objects.filter(subjectUser__userType=userType, subjectUser__profileId=profileId)
+
+
+def updateNotificationStatus(requestData, notifications):
+    """
+    Function that sets the message status of many notifications in a single UPDATE. The
+    notifications are chosen by a list of ids, or by `upTo` for every notification up to an id.
+    The status defaults to the read status.
+    """
+
+    if not isinstance(requestData, dict):
+        return Response({'message': 'Invalid request'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if 'messageStatusId' in requestData.keys():
+        messageStatusId = requestData['messageStatusId']
+        if type(messageStatusId) != int:
+            return Response({'message': 'messageStatusId must be a message status id'}, status=status.HTTP_400_BAD_REQUEST)
+        if not MessageStatus.objects.filter(id=messageStatusId).exists():
+            return Response({'message': 'Invalid message status'}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        messageStatusId = MessageStatus.objects.filter(
+            name=settings.MESSAGE_STATUS_READ).values_list('id', flat=True).first()
+        if messageStatusId is None:
+            return Response({'message': 'An issue with our message status. Please contact mailto:tobia807@gmail.com'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if 'ids' in requestData.keys():
+        ids = requestData['ids']
+        if type(ids) != list or len(ids) == 0 or len(ids) > settings.NOTIFICATION_BULK_LIMIT or any(type(e) != int for e in ids):
+            return Response({'message': 'ids must be a list of at most {} notification ids'.format(settings.NOTIFICATION_BULK_LIMIT)}, status=status.HTTP_400_BAD_REQUEST)
+        notifications = notifications.filter(id__in=ids)
+    elif 'upTo' in requestData.keys():
+        if type(requestData['upTo']) != int:
+            return Response({'message': 'upTo must be a notification id'}, status=status.HTTP_400_BAD_REQUEST)
+        notifications = notifications.filter(id__lte=requestData['upTo'])
+    else:
+        return Response({'message': 'Required fields missing',
+                         'missing-fields': ['ids or upTo']}, status=status.HTTP_403_FORBIDDEN)
+
+    updated = notifications.exclude(
+        messageStatusId=messageStatusId).update(messageStatusId=messageStatusId)
+    return Response({'updated': updated, 'messageStatusId': messageStatusId})
+
+
+def countUnreadNotifications(notifications):
+    """
+    Function that counts unread notifications in one query, using the (subject, status) and
+    (order, status) indexes.
+    """
+
+    return Response({'unread': notifications.filter(
+        messageStatusId__name=settings.MESSAGE_STATUS_UNREAD).count()})
+
+
+def broadcastNotification(vendorId, requestData):
+    """
+    Function that sends `message` to every customer with an open order from a vendor, or only to
+    those whose open orders include the menu `menuId`. Each customer gets one notification, on
+    their latest open order. Recipients come from one query read in chunks, and notifications are
+    created NOTIFICATION_BROADCAST_BATCH_SIZE at a time in one transaction.
+    """
+
+    if not isinstance(requestData, dict):
+        return Response({'message': 'Invalid request'}, status=status.HTTP_400_BAD_REQUEST)
+
+    message = requestData.get('message')
+    if type(message) != str or not message.strip():
+        return Response({'message': 'Required fields missing',
+                         'missing-fields': ['message']}, status=status.HTTP_403_FORBIDDEN)
+
+    orders = Order.objects.filter(vendorId=vendorId).exclude(
+        orderStatusId__name__in=settings.ORDER_STATUSES_CLOSED)
+
+    if 'menuId' in requestData.keys():
+        if type(requestData['menuId']) != int:
+            return Response({'message': 'menuId must be a menu id'}, status=status.HTTP_400_BAD_REQUEST)
+        orders = orders.filter(orderitem__menuId=requestData['menuId'])
+
+    unreadStatusId = MessageStatus.objects.filter(
+        name=settings.MESSAGE_STATUS_UNREAD).values_list('id', flat=True).first()
+    if unreadStatusId is None:
+        return Response({'message': 'An issue with our message status. Please contact mailto:tobia807@gmail.com'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Notifications are addressed to the login of each customer
+    recipients = orders.annotate(recipient=Subquery(Auth.objects.filter(
+        userType='customer', profileId=OuterRef('customerId')).values('id')[:1])).filter(
+        recipient__isnull=False).order_by('customerId', '-id').distinct('customerId').values_list('id', 'recipient')
+
+    notified = 0
+    with transaction.atomic():
+        rows = recipients.iterator(chunk_size=settings.NOTIFICATION_BROADCAST_BATCH_SIZE)
+        while True:
+            chunk = list(islice(rows, settings.NOTIFICATION_BROADCAST_BATCH_SIZE))
+            if not chunk:
+                break
+            Notification.objects.bulk_create([Notification(
+                subjectUser_id=recipient, orderId_id=orderId, message=message, messageStatusId_id=unreadStatusId)
+                for orderId, recipient in chunk])
+            notified += len(chunk)
+
+    return Response({'notified': notified, 'message': message, 'menuId': requestData.get('menuId')},
+                    status=status.HTTP_201_CREATED)
+
+
+def parseDateTime(value):
+    """
+    Function that parses an ISO 8601 date and time, or gives None if it is not one. Well formed
+    values out of range, like a 13th month, are not.
+    """
+
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
+
+
+def getArchivedOrders(request, archivedOrders):
+    """
+    Function that pages through archived orders, newest first. `from` and `to` bound the date of
+    the orders and `before` continues after the last archived order id of the previous page.
+    """
+
+    sparse = SparseFields(request, OrderArchiveSerializer)
+    try:
+        if sparse.error:
+            return sparse.errorResponse()
+    except:
+        pass
+
+    queryParams = request.query_params
+
+    for param in ['from', 'to']:
+        if param in queryParams.keys() and parseDateTime(queryParams[param]) is None:
+            return Response({'message': '{} must be an ISO 8601 date and time'.format(param)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if 'from' in queryParams.keys():
+        archivedOrders = archivedOrders.filter(
+            dateAndTimeOfOrder__gte=parseDateTime(queryParams['from']))
+    if 'to' in queryParams.keys():
+        archivedOrders = archivedOrders.filter(
+            dateAndTimeOfOrder__lt=parseDateTime(queryParams['to']))
+
+    if 'before' in queryParams.keys():
+        anchor = None
+        if queryParams['before'].isdigit():
+            anchor = archivedOrders.filter(id=queryParams['before']).values_list(
+                'dateAndTimeOfOrder', flat=True).first()
+        if anchor is None:
+            return Response({'message': 'before must be the id of an archived order'}, status=status.HTTP_400_BAD_REQUEST)
+        archivedOrders = archivedOrders.filter(Q(dateAndTimeOfOrder__lt=anchor) | Q(
+            dateAndTimeOfOrder=anchor, id__lt=queryParams['before']))
+
+    orders = orderArchiveValues.many(archivedOrders.order_by(
+        '-dateAndTimeOfOrder', '-id')[:settings.ORDER_ARCHIVE_PAGE_SIZE], sparse.fields)
+
+    return Response({'orders': orders,
+                     'before': orders[-1]['id'] if len(orders) == settings.ORDER_ARCHIVE_PAGE_SIZE else None})
+
+
+class OrderFeed():
+    # Sort keys a vendor order feed can be ordered by, each backed by an index led by vendorId.
+    # They never change once an order is made, so a cursor taken from one page stays in place.
+    sortFields = ['dateAndTimeOfOrder', 'preOrderDateTime']
+
+    def __init__(self, queryParams, orders):
+        """
+        Orders filtered by `status` (comma separated order status ids), `from`/`to` on the order
+        date, `preOrderFrom`/`preOrderTo` on the pre-order date and `outstanding` (true or false),
+        sorted by `sort` and cut to a page of `limit` orders. `after` continues from the cursor
+        given with the previous page.
+        """
+
+        if 'status' in queryParams.keys():
+            statusIds = queryParams['status'].split(',')
+            if not all(statusId.isdigit() for statusId in statusIds):
+                self.error = {'message': 'status must be comma separated order status ids',
+                              'status': status.HTTP_400_BAD_REQUEST}
+                return
+            orders = orders.filter(orderStatusId__in=statusIds)
+
+        for param, lookup in [('from', 'dateAndTimeOfOrder__gte'), ('to', 'dateAndTimeOfOrder__lt'),
+                              ('preOrderFrom', 'preOrderDateTime__gte'), ('preOrderTo', 'preOrderDateTime__lt')]:
+            if param in queryParams.keys():
+                dateTime = parseDateTime(queryParams[param])
+                if dateTime is None:
+                    self.error = {'message': '{} must be an ISO 8601 date and time'.format(param),
+                                  'status': status.HTTP_400_BAD_REQUEST}
+                    return
+                orders = orders.filter(**{lookup: dateTime})
+
+        if 'outstanding' in queryParams.keys():
+            if queryParams['outstanding'] not in ['true', 'false']:
+                self.error = {'message': 'outstanding must be true or false',
+                              'status': status.HTTP_400_BAD_REQUEST}
+                return
+            if queryParams['outstanding'] == 'true':
+                orders = orders.filter(amountOutstanding__gt=0)
+            else:
+                orders = orders.filter(amountOutstanding__lte=0)
+
+        self.sort = queryParams.get('sort', '-dateAndTimeOfOrder')
+        self.sortField = self.sort.lstrip('-')
+        if self.sortField not in self.sortFields:
+            self.error = {'message': 'sort must be one of {}, with a leading - for descending order'.format(', '.join(self.sortFields)),
+                          'status': status.HTTP_400_BAD_REQUEST}
+            return
+        descending = self.sort.startswith('-')
+
+        # Orders that are not pre-orders have no place in a pre-order sort
+        if self.sortField == 'preOrderDateTime':
+            orders = orders.filter(preOrderDateTime__isnull=False)
+
+        limit = queryParams.get('limit', str(settings.ORDER_FEED_PAGE_SIZE))
+        if not limit.isdigit() or not 0 < int(limit) <= settings.ORDER_FEED_MAX_PAGE_SIZE:
+            self.error = {'message': 'limit must be between 1 and {}'.format(settings.ORDER_FEED_MAX_PAGE_SIZE),
+                          'status': status.HTTP_400_BAD_REQUEST}
+            return
+        self.limit = int(limit)
+
+        if 'after' in queryParams.keys():
+            anchor = self.readCursor(queryParams['after'])
+            if anchor is None:
+                self.error = {'message': 'after must be the cursor given with the previous page',
+                              'status': status.HTTP_400_BAD_REQUEST}
+                return
+            sortValue, orderId = anchor
+            beyond = '__lt' if descending else '__gt'
+            orders = orders.filter(Q(**{self.sortField + beyond: sortValue}) | Q(
+                **{self.sortField: sortValue, 'id' + beyond: orderId}))
+
+        self.orders = orders.order_by(self.sort, '-id' if descending else 'id')[:self.limit]
+
+    def cursor(self, order):
+        """
+        Function that gives the opaque cursor of the page after a serialized order. It carries
+        the sort and the sort value and id of the order, so the order is not read again.
+        """
+
+        return urlsafe_b64encode(json.dumps([self.sort, order[self.sortField], order['id']]).encode('utf-8')).decode('ascii')
+
+    def readCursor(self, cursor):
+        """
+        Function that gives the sort value and order id a cursor of the same sort carries, or
+        None if it is not one.
+        """
+
+        try:
+            sort, sortValue, orderId = json.loads(urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError):
+            return None
+        if sort != self.sort or type(orderId) != int or type(sortValue) != str:
+            return None
+        sortValue = parseDateTime(sortValue)
+        return (sortValue, orderId) if sortValue else None
+
+    def page(self, fields):
+        """
+        Function that serializes the orders with the given fields, and gives them with the
+        cursor of the next page, or None after the last page.
+        """
+
+        fields = fields or orderValues.fields
+        keyFields = [field for field in [self.sortField, 'id'] if field not in fields]
+        orders = orderValues.many(self.orders, fields + keyFields)
+        nextCursor = self.cursor(orders[-1]) if len(orders) == self.limit else None
+        for order in orders:
+            for field in keyFields:
+                del order[field]
+        return orders, nextCursor
+
+    def errorResponse(self):
+        return Response({'message': self.error['message']
+                         }, status=self.error['status'])
+
+
+class OrderStatusTransition():
+    def __init__(self, vendorId, requestData):
+        """
+        Function that validates moving the orders `ids` of a vendor to the order status
+        `orderStatus`. The statuses an order may move to from its current one are given by name
+        in ORDER_STATUS_TRANSITIONS.
+        """
+
+        self.vendorId = vendorId
+        self.errors = []
+
+        if not isinstance(requestData, dict):
+            self.error = {'message': 'Invalid request',
+                          'status': status.HTTP_400_BAD_REQUEST}
+            return
+
+        ids = requestData.get('ids')
+        if type(ids) != list or len(ids) == 0 or len(ids) > settings.ORDER_STATUS_BULK_LIMIT or any(type(e) != int for e in ids):
+            self.error = {'message': 'ids must be a list of at most {} order ids'.format(settings.ORDER_STATUS_BULK_LIMIT),
+                          'status': status.HTTP_400_BAD_REQUEST}
+            return
+        self.ids = list(dict.fromkeys(ids))
+
+        self.statuses = dict(OrderStatus.objects.values_list('id', 'name'))
+        if requestData.get('orderStatus') not in self.statuses.keys():
+            self.error = {'message': 'Invalid order status',
+                          'status': status.HTTP_400_BAD_REQUEST}
+            return
+        self.orderStatusId = requestData['orderStatus']
+        self.orderStatus = self.statuses[self.orderStatusId]
+
+        self.unreadStatusId = MessageStatus.objects.filter(
+            name=settings.MESSAGE_STATUS_UNREAD).values_list('id', flat=True).first()
+        if self.unreadStatusId is None:
+            self.error = {'message': 'An issue with our message status. Please contact mailto:tobia807@gmail.com',
+                          'status': status.HTTP_400_BAD_REQUEST}
+
+    def isAllowed(self, orderStatusId):
+        return self.orderStatus in settings.ORDER_STATUS_TRANSITIONS.get(self.statuses.get(orderStatusId), [])
+
+    def save(self):
+        """
+        Function that moves every order in one UPDATE and notifies their customers in the same
+        transaction. The orders are locked while their transitions are checked; if any order is
+        missing or cannot move, none is changed and `self.errors` lists why.
+        """
+
+        with transaction.atomic():
+            orders = {orderId: (customerId, orderStatusId) for orderId, customerId, orderStatusId in Order.objects.select_for_update().filter(
+                vendorId=self.vendorId, id__in=self.ids).values_list('id', 'customerId', 'orderStatusId')}
+
+            for orderId in self.ids:
+                if orderId not in orders.keys():
+                    self.errors.append({'id': orderId, 'errors': ['Order not found for user']})
+                elif not self.isAllowed(orders[orderId][1]):
+                    self.errors.append({'id': orderId, 'errors': ['An order cannot move from {} to {}'.format(
+                        self.statuses.get(orders[orderId][1]), self.orderStatus)]})
+            if self.errors:
+                return None
+
+            Order.objects.filter(vendorId=self.vendorId, id__in=self.ids).update(
+                orderStatusId=self.orderStatusId)
+            customerOrderCache.invalidate(*[customerId for customerId, orderStatusId in orders.values()])
+
+            # Notifications are addressed to the login of each customer
+            recipients = dict(Auth.objects.filter(userType='customer', profileId__in=set(
+                customerId for customerId, orderStatusId in orders.values())).values_list('profileId', 'id'))
+            notifications = Notification.objects.bulk_create([Notification(
+                subjectUser_id=recipients[customerId], orderId_id=orderId, messageStatusId_id=self.unreadStatusId,
+                message=settings.ORDER_STATUS_NOTIFICATION_MESSAGE.format(orderId=orderId, status=self.orderStatus))
+                for orderId, (customerId, orderStatusId) in orders.items() if customerId in recipients.keys()])
+
+        return {'updated': len(self.ids), 'ids': self.ids, 'orderStatusId': self.orderStatusId,
+                'orderStatus': self.orderStatus, 'notified': len(notifications)}
+
+    def errorResponse(self):
+        return Response({'message': self.error['message']
+                         }, status=self.error['status'])
+
+
 class getDefaultForeignKey():
     def __init__(self, RelatedModel):
         try:
@@ -244,6 +832,7 @@ class HomeDescAPIView(APIView):
         return Response({
             # authentication
             'login/POST': '{}login/'.format(app_base_route),
+            'logout/POST': '{}auth/logout/'.format(app_base_route),
             'vendor/GET-POST/': '{}vendor/'.format(app_base_route),
             'customer-signup/POST/': '{}customer/'.format(app_base_route),
 
@@ -252,21 +841,34 @@ class HomeDescAPIView(APIView):
             'auth-vendor-menu/GET-PUT-DELETE/': '{}auth/vendor/menu/1/'.format(app_base_route),
             'auth-vendor-orders/GET/': '{}auth/vendor/order/'.format(app_base_route),
             'auth-vendor-order/GET-PATCH/order-status/': '{}auth/vendor/order/1/'.format(app_base_route),
+            'auth-vendor-order-archive/GET/': '{}auth/vendor/order/archive/'.format(app_base_route),
             'auth-vendor-sales/GET/': '{}auth/vendor/sales/daily/'.format(app_base_route),
             'auth-vendor-notifications/GET-POST/customer/': '{}auth/vendor/notification/'.format(app_base_route),
             'auth-vendor-notification/GET/': '{}auth/vendor/notification/1/'.format(app_base_route),
+            'auth-vendor-notification-status/PATCH/': '{}auth/vendor/notification/status/'.format(app_base_route),
+            'auth-vendor-notification-unread-count/GET/': '{}auth/vendor/notification/unread-count/'.format(app_base_route),
 
             # public
             'get-all-menus/GET/': '{}menu/'.format(app_base_route),
+            'get-menu-changes/GET/': '{}menu/changes/?since=0'.format(app_base_route),
             'get-all-menu-by-a-vendor/GET/': '{}vendor/1/menu/'.format(app_base_route),
             'get-a-menu/GET/': '{}menu/1/'.format(app_base_route),
 
             # auth customer
             'auth-customer-orders/GET-POST/': '{}auth/customer/order/'.format(app_base_route),
             'auth-customer-order/GET-DELETE/': '{}auth/customer/order/1'.format(app_base_route),
+            'auth-customer-order-archive/GET/': '{}auth/customer/order/archive/'.format(app_base_route),
             'auth-customer-payment/PATCH/': '{}auth/customer/order/payment/1'.format(app_base_route),
             'customer-notifications/GET/': '{}auth/customer/notification/'.format(app_base_route),
             'customer-notification/GET/': '{}auth/customer/notification/1'.format(app_base_route),
+            'customer-notification-status/PATCH/': '{}auth/customer/notification/status/'.format(app_base_route),
+            'customer-notification-unread-count/GET/': '{}auth/customer/notification/unread-count/'.format(app_base_route),
+
+            # admin
+            'admin-revoke-tokens/POST/': '{}auth/admin/token/revoke/'.format(app_base_route),
+            'admin-bulk-vendors/POST/': '{}auth/admin/vendor/bulk/'.format(app_base_route),
+            'admin-bulk-customers/POST/': '{}auth/admin/customer/bulk/'.format(app_base_route),
+            'admin-account-deletion/GET-DELETE/': '{}auth/admin/vendor/1/'.format(app_base_route),
         })
 
 
@@ -283,20 +885,26 @@ class LoginAPIView(APIView):
     API endpoint that allows users to log in.
     """
 
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
+
+    profileValues = {'vendor': vendorValues, 'customer': customerValues}
+    profileModels = {'vendor': Vendor, 'customer': Customer}
+
     class userAuth():
-        def __init__(self, modelSerializer, userType):
+        def __init__(self, profileData, userType):
             """
             An object of essential details user details
             """
 
             self.username = userType,
-            self.email = modelSerializer.data['email'],
-            self.pk = modelSerializer.data['id'],
+            self.email = profileData['email'],
+            self.pk = profileData['id'],
             self.userType = userType
 
-    def generateToken(self, modelSerializer, userType):
-        userObject = self.userAuth(modelSerializer, userType)
+    def generateToken(self, profileData, userType):
+        userObject = self.userAuth(profileData, userType)
         tokenPayload = api_settings.JWT_PAYLOAD_HANDLER(userObject)
+        tokenPayload['jti'] = uuid4().hex
         return api_settings.JWT_ENCODE_HANDLER(tokenPayload)
 
     def post(self, request):
@@ -316,10 +924,10 @@ class LoginAPIView(APIView):
         except:
             pass
 
-        # check that user is signed up
+        # check that user is signed up, the role and profile are stored with the login details
 
         try:
-            authUser = Auth.objects.get(
+            authUser = Auth.objects.only('password', 'userType', 'profileId', 'isActive').get(
                 email=requestData['email'])
         except Auth.DoesNotExist:
             return Response({
@@ -328,52 +936,76 @@ class LoginAPIView(APIView):
 
         # confirm password
 
-        authSerializer = AuthSerializer(authUser)
+        import bcrypt
 
-        if not bcrypt.checkpw(requestData['password'].encode('utf-8'), authSerializer.data['password'].encode('utf-8')):
+        if not bcrypt.checkpw(requestData['password'].encode('utf-8'), authUser.password.encode('utf-8')):
             return Response({
                 'message': 'Wrong username or password. Ensure your email and password are correct'.format(app_base_route, app_base_route)
             }, status=status.HTTP_401_UNAUTHORIZED)
 
+        # deactivated accounts are waiting to be deleted
+
+        if not authUser.isActive:
+            return Response({
+                'message': 'This account has been deactivated. Contact us at mailto:help@fva.org for more details.'
+            }, status=status.HTTP_403_FORBIDDEN)
+
         # confirm user profile
 
-        try:
-            vendor = Vendor.objects.get(email=requestData['email'])
-        except Vendor.DoesNotExist:
-            try:
-                customer = Customer.objects.get(email=requestData['email'])
-            except Customer.DoesNotExist:
-                return Response({
-                    'message': 'No user profile matching this user. Contact us at mailto:help@fva.org to rectify this issue.'
-                }, status=status.HTTP_404_NOT_FOUND)
+        if authUser.userType not in self.profileModels.keys():
+            return Response({
+                'message': 'No user profile matching this user. Contact us at mailto:help@fva.org to rectify this issue.'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        profileData = self.profileValues[authUser.userType].one(
+            self.profileModels[authUser.userType].objects.filter(id=authUser.profileId))
+
+        if profileData is None:
+            return Response({
+                'message': 'No user profile matching this user. Contact us at mailto:help@fva.org to rectify this issue.'
+            }, status=status.HTTP_404_NOT_FOUND)
 
         # process response
 
-        if 'vendor' in locals():
-            vendorSerializer = VendorSerializer(vendor)
-            accessToken = self.generateToken(vendorSerializer, 'vendor')
-            return Response(
-                {'latestLogin': str(datetime.utcnow()),
-                 'exp': '20-hrs',
-                 'data': vendorSerializer.data},
-                headers={
-                    'Set-Cookie': 'FVA-USER={}; domain={}; path=/api/auth; max-age=72000; HttpOnly'.format(accessToken, getenv('APP_DOMAIN_NAME'))
-                })
-
-        if 'customer' in locals():
-            customerSerializer = CustomerSerializer(customer)
-            accessToken = self.generateToken(customerSerializer, 'customer')
-            return Response(
-                {'latestLogin': str(datetime.utcnow()),
-                 'exp': '20-hrs',
-                 'data': customerSerializer.data},
-                headers={
-                    'Set-Cookie': 'FVA-USER={}; domain={}; path=/api/auth; max-age=72000; HttpOnly'.format(accessToken, getenv('APP_DOMAIN_NAME'))
-                })
+        accessToken = self.generateToken(profileData, authUser.userType)
+        return Response(
+            {'latestLogin': str(datetime.utcnow()),
+             'exp': '20-hrs',
+             'data': profileData},
+            headers={
+                'Set-Cookie': 'FVA-USER={}; domain={}; path=/api/auth; max-age=72000; HttpOnly'.format(accessToken, getenv('APP_DOMAIN_NAME'))
+            })
 
-        return Response({
-            'message': 'Conflicting user profile? Contact us at mailto:tobia807@gmail.com.'
-        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+# user logout
+
+
+class LogoutAPIView(APIView):
+    """
+    API endpoint that allows users to log out.
+    """
+
+    def post(self, request):
+        """
+        API method that revokes the token of the logged in user and clears its cookie.
+        """
+
+        try:
+            userPayload = api_settings.JWT_DECODE_HANDLER(
+                request.COOKIES['FVA-USER'])
+        except:
+            return Response({'message': 'Log on to {}login to login'.format(app_base_route)
+                             }, status=status.HTTP_401_UNAUTHORIZED)
+
+        if 'jti' in userPayload.keys():
+            revocationList.revoke(userPayload['jti'], datetime.fromtimestamp(
+                userPayload['exp'], tz=timezone.utc))
+
+        return Response(
+            {'message': 'Successfully logged out'},
+            headers={
+                'Set-Cookie': 'FVA-USER=; domain={}; path=/api/auth; max-age=0; HttpOnly'.format(getenv('APP_DOMAIN_NAME'))
+            })
 
 
 # vendor view, vendor sign up
@@ -384,14 +1016,22 @@ class VendorAPIView(APIView):
     API endpoint that allows vendors to be viewed.
     """
 
+    throttle_classes = [SignupIPThrottle, SignupEmailThrottle]
+
     def get(self, request):
         """
-        API method that allows all vendors to be viewed.
+        API method that allows all vendors to be viewed, except those scheduled for deletion.
         """
 
-        vendors = Vendor.objects.all()
-        vendorSerializer = VendorSerializer(vendors, many=True)
-        return Response(vendorSerializer.data)
+        sparse = SparseFields(request, VendorSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        vendors = Vendor.objects.filter(isActive=True)
+        return Response(vendorValues.many(vendors, sparse.fields))
 
     def post(self, request):
         """
@@ -414,11 +1054,10 @@ class VendorAPIView(APIView):
         if not regex.search(emailFormat, requestData['email']):
             return Response({'message': 'Invalid email'}, status=status.HTTP_400_BAD_REQUEST)
 
-        phone = phoneparse(requestData['phoneNumber'], 'NG')
-        if not is_valid_number(phone):
+        requestData['phoneNumber'] = formatPhoneNumber(
+            requestData['phoneNumber'])
+        if requestData['phoneNumber'] is None:
             return Response({'message': 'Phone number must be valid Nigerian number'}, status=status.HTTP_400_BAD_REQUEST)
-        requestData['phoneNumber'] = format_phone(
-            phone, PhoneNumberFormat.E164)
 
         validPassword = SanitizePassword(requestData['password'])
         try:
@@ -439,8 +1078,9 @@ class VendorAPIView(APIView):
             vendorSerializer = VendorSerializer(data=requestData)
 
             if vendorSerializer.is_valid():
-                authSerializer.save()
-                vendorSerializer.save()
+                with transaction.atomic():
+                    vendor = vendorSerializer.save()
+                    authSerializer.save(userType='vendor', profileId=vendor.id)
                 return Response(vendorSerializer.data, status=status.HTTP_201_CREATED)
             return Response(vendorSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
         else:
@@ -455,6 +1095,8 @@ class CustomerAPIView(APIView):
     API endpoint that allows a customer to be viewed or edited.
     """
 
+    throttle_classes = [SignupIPThrottle, SignupEmailThrottle]
+
     def post(self, request):
         """
         API method that allows a new customer to be created.
@@ -476,11 +1118,10 @@ class CustomerAPIView(APIView):
         if not regex.search(emailFormat, requestData['email']):
             return Response({'message': 'Invalid email'}, status=status.HTTP_400_BAD_REQUEST)
 
-        phone = phoneparse(requestData['phoneNumber'], 'NG')
-        if not is_valid_number(phone):
+        requestData['phoneNumber'] = formatPhoneNumber(
+            requestData['phoneNumber'])
+        if requestData['phoneNumber'] is None:
             return Response({'message': 'Phone number must be valid Nigerian number'}, status=status.HTTP_400_BAD_REQUEST)
-        requestData['phoneNumber'] = format_phone(
-            phone, PhoneNumberFormat.E164)
 
         validPassword = SanitizePassword(requestData['password'])
         try:
@@ -501,8 +1142,9 @@ class CustomerAPIView(APIView):
             customerSerializer = CustomerSerializer(data=requestData)
 
             if customerSerializer.is_valid():
-                authSerializer.save()
-                customerSerializer.save()
+                with transaction.atomic():
+                    customer = customerSerializer.save()
+                    authSerializer.save(userType='customer', profileId=customer.id)
                 return Response(customerSerializer.data, status=status.HTTP_201_CREATED)
             return Response(customerSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
         else:
@@ -537,13 +1179,19 @@ class AuthVendorMenuAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        sparse = SparseFields(request, MenuSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
         try:
             menu = Menu.objects.filter(vendorId=userPayload['user_id'])
         except Menu.DoesNotExist:
             return Response({'message': 'You have not created any food menu recently'}, status=status.HTTP_204_NO_CONTENT)
 
-        menuSerializer = MenuSerializer(menu, many=True)
-        return Response(menuSerializer.data)
+        return Response(menuValues.many(menu, sparse.fields))
 
     def post(self, request):
         """
@@ -590,7 +1238,9 @@ class AuthVendorMenuAPIView(APIView):
         menuSerializer = MenuSerializer(data=requestData)
 
         if menuSerializer.is_valid():
-            menuSerializer.save()
+            with transaction.atomic():
+                menuSerializer.save()
+                bumpMenuVersion(userPayload['user_id'])
             return Response(menuSerializer.data, status=status.HTTP_201_CREATED)
         return Response(menuSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -678,7 +1328,9 @@ class AuthVendorMenuDetailAPIView(APIView):
         menuSerializer = MenuSerializer(menu, requestData, partial=True)
 
         if menuSerializer.is_valid():
-            menuSerializer.save()
+            with transaction.atomic():
+                menuSerializer.save()
+                bumpMenuVersion(userPayload['user_id'])
             return Response(menuSerializer.data)
         return Response(menuSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -707,7 +1359,9 @@ class AuthVendorMenuDetailAPIView(APIView):
 
         # Delete the food menu
 
-        menu.delete()
+        with transaction.atomic():
+            menu.delete()
+            bumpMenuVersion(userPayload['user_id'])
         return Response({'message': 'Successfully deleted'}, status=status.HTTP_200_OK)
 
 
@@ -721,7 +1375,9 @@ class AuthVendorOrderAPIView(APIView):
 
     def get(self, request):
         """
-        API method that allows authorized vendor to view all his food orders.
+        API method that allows authorized vendor to view his food orders, newest first, a page at
+        a time. The orders can be filtered and sorted as described in OrderFeed. Full pages carry
+        the cursor of the next one in the X-FVA-After header.
         """
 
         # Authenticate/Authorize user
@@ -734,6 +1390,13 @@ class AuthVendorOrderAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        sparse = SparseFields(request, OrderSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
         # check for vendors orders
 
         try:
@@ -741,8 +1404,45 @@ class AuthVendorOrderAPIView(APIView):
         except Order.DoesNotExist:
             return Response({'message': 'No orders have been made to you in a while'}, status=status.HTTP_404_NOT_FOUND)
 
-        orderSerializer = OrderSerializer(order, many=True)
-        return Response(orderSerializer.data)
+        orderFeed = OrderFeed(request.query_params, order)
+        try:
+            if orderFeed.error:
+                return orderFeed.errorResponse()
+        except:
+            pass
+
+        orders, nextCursor = orderFeed.page(sparse.fields)
+        response = Response(orders)
+        if nextCursor:
+            response['X-FVA-After'] = nextCursor
+        return response
+
+
+# auth vendor view archived orders
+
+
+class AuthVendorOrderArchiveAPIView(APIView):
+    """
+    API endpoint that allows authorized vendor view his archived food orders.
+    """
+
+    def get(self, request):
+        """
+        API method that allows authorized vendor to page through his completed and paid orders
+        that were moved to the archive.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'vendor')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return getArchivedOrders(request, OrderArchive.objects.filter(vendorId=userPayload['user_id']))
 
 
 # auth vendor view an order, update order status
@@ -768,13 +1468,20 @@ class AuthVendorOrderDetailAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        sparse = SparseFields(request, OrderSerializer)
         try:
-            order = Order.objects.get(
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        try:
+            order = Order.objects.only(*sparse.fields).get(
                 vendorId=userPayload['user_id'], id=order_id)
         except Order.DoesNotExist:
             return Response({'message': 'Order not found for user'}, status=status.HTTP_404_NOT_FOUND)
 
-        orderSerializer = OrderSerializer(order)
+        orderSerializer = OrderSerializer(order, fields=sparse.fields)
         return Response(orderSerializer.data)
 
     def patch(self, request, order_id):
@@ -819,10 +1526,51 @@ class AuthVendorOrderDetailAPIView(APIView):
 
         if orderSerializer.is_valid():
             orderSerializer.save()
+            customerOrderCache.invalidate(order.customerId_id)
             return Response(orderSerializer.data)
         return Response(orderSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# auth vendor update the status of many orders
+
+
+class AuthVendorOrderStatusAPIView(APIView):
+    """
+    API endpoint that allows authorized vendor to update the status of many orders at once.
+    """
+
+    def patch(self, request):
+        """
+        API method that moves the orders `ids` to the order status `orderStatus` and notifies
+        their customers, or changes nothing if any order cannot make the move.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'vendor')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        # Validate and apply the status transitions
+
+        transition = OrderStatusTransition(userPayload['user_id'], request.data)
+        try:
+            if transition.error:
+                return transition.errorResponse()
+        except:
+            pass
+
+        updated = transition.save()
+        if transition.errors:
+            return Response({'message': 'No order status was changed. Fix the invalid orders and try again',
+                             'errors': transition.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(updated)
+
+
 # auth vendor view daily sales report
 
 
@@ -854,18 +1602,12 @@ class AuthVendorSalesReportAPIView(APIView):
         except Order.DoesNotExist:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        orderSerializer = OrderSerializer(orders, many=True)
-
-        ordersOfTheDay = []
-
-        # Extract only orders for the last 24hrs
+        # Extract only orders for the last 24hrs, the day before midnight is selected in the database
         today = datetime.now()
         midnight = datetime(today.year, today.month,
-                            today.day, 0, 0, 0, 0, tzinfo=pytz.utc)
-        for e in orderSerializer.data:
-            if (midnight - datetime.strptime(
-                    e['dateAndTimeOfOrder'], '%Y-%m-%dT%H:%M:%S.%fZ').astimezone(tz=pytz.utc)).days == 0:
-                ordersOfTheDay.append(e)
+                            today.day, 0, 0, 0, 0, tzinfo=timezone.utc)
+        ordersOfTheDay = orderValues.many(orders.filter(
+            dateAndTimeOfOrder__gt=midnight - timedelta(days=1), dateAndTimeOfOrder__lte=midnight))
 
         responseData = {'salesList': [],
                         'totalAmountAtHand': 0,
@@ -911,27 +1653,19 @@ class VendorNotificationAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
-        # Check for orders associated with vendor
-
+        sparse = SparseFields(request, NotificationSerializer)
         try:
-            orders = Order.objects.filter(vendorId=userPayload['user_id'])
-        except Order.DoesNotExist:
-            return Response({'message': 'No food orders to prompt notifications'}, status=status.HTTP_400_BAD_REQUEST)
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
 
-        orderSerializer = OrderSerializer(orders, many=True)
-        response = []
+        # Notifications on orders made to the vendor, sorted grouped by order
 
-        for e in orderSerializer.data:
-            try:
-                notifications = Notification.objects.filter(orderId=e['id'])
-            except Notification.DoesNotExist:
-                continue
+        notifications = Notification.objects.filter(
+            orderId__vendorId=userPayload['user_id']).order_by('orderId', 'id')
 
-            if notifications:
-                # Notifications sorted grouped by order
-                notificationSerializer = NotificationSerializer(
-                    notifications, many=True)
-                response.extend(notificationSerializer.data)
+        response = notificationValues.many(notifications, sparse.fields)
 
         if len(response) == 0:
             return Response({'message': 'No notifications to show'}, status=status.HTTP_204_NO_CONTENT)
@@ -951,7 +1685,7 @@ class VendorNotificationAPIView(APIView):
             messageStatus[e['id']] = e['name']
 
         for e in response:
-            if e['messageStatusId'] in messageStatus.keys():
+            if e.get('messageStatusId') in messageStatus.keys():
                 e['messageStatus'] = messageStatus[e['messageStatusId']]
                 e.pop('messageStatusId')
         return Response(response)
@@ -983,10 +1717,14 @@ class VendorNotificationAPIView(APIView):
         except:
             pass
 
-        try:
-            Order.objects.filter(
-                vendorId=userPayload['user_id'], customerId=requestData['subjectUser'])
-        except Order.DoesNotExist:
+        # The recipient is given by customer id, notifications are addressed to the customer's login
+
+        if not Order.objects.filter(id=requestData['orderId'], vendorId=userPayload['user_id'], customerId=requestData['subjectUser']).exists():
+            return Response({'message': 'No recipient found for the given order'}, status=status.HTTP_404_NOT_FOUND)
+
+        requestData['subjectUser'] = Auth.objects.filter(
+            userType='customer', profileId=requestData['subjectUser']).values_list('id', flat=True).first()
+        if requestData['subjectUser'] is None:
             return Response({'message': 'No recipient found for the given order'}, status=status.HTTP_404_NOT_FOUND)
 
         # Get message status name
@@ -1036,37 +1774,109 @@ class VendorNotificationDetailAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        # The notification must be on an order made to the vendor
+
         try:
-            orders = Order.objects.filter(vendorId=userPayload['user_id'])
-        except Order.DoesNotExist:
-            return Response({'message': 'No food orders to prompt notifications'}, status=status.HTTP_404_NOT_FOUND)
+            notification = Notification.objects.get(
+                orderId__vendorId=userPayload['user_id'], id=notification_id)
+        except Notification.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND)
 
-        orderSerializer = OrderSerializer(orders, many=True)
+        notificationSerializer = NotificationSerializer(notification)
 
-        for e in orderSerializer.data:
-            try:
-                notification = Notification.objects.get(
-                    orderId=e['id'], id=notification_id)
-            except Notification.DoesNotExist:
-                continue
+        # Get message statuses
 
-            if 'notification' in locals():
-                notificationSerializer = NotificationSerializer(notification)
+        try:
+            messageStatus = MessageStatus.objects.get(
+                id=notificationSerializer.data['messageStatusId'])
+        except MessageStatus.DoesNotExist:
+            return Response({'message': 'An issue with our message status. Please contact mailto:tobia807@gmail.com'}, status=status.HTTP_400_BAD_REQUEST)
 
-                # Get message statuses
+        messageStatusSerializer = MessageStatusSerializer(messageStatus)
+        response = {**notificationSerializer.data}
+        response['messageStatusId'] = messageStatusSerializer.data['name']
+        return Response(response)
 
-                try:
-                    messageStatus = MessageStatus.objects.get(
-                        id=notificationSerializer.data['messageStatusId'])
-                except MessageStatus.DoesNotExist:
-                    return Response({'message': 'An issue with our message status. Please contact mailto:tobia807@gmail.com'}, status=status.HTTP_400_BAD_REQUEST)
 
-                messageStatusSerializer = MessageStatusSerializer(
-                    messageStatus)
-                response = {**notificationSerializer.data}
-                response['messageStatusId'] = messageStatusSerializer.data['name']
-                return Response(response)
-        return Response(status=status.HTTP_404_NOT_FOUND)
+# auth vendor update notification statuses
+
+
+class VendorNotificationStatusAPIView(APIView):
+    """
+    API endpoint that allows authorized vendor to change the status of many notifications at once.
+    """
+
+    def patch(self, request):
+        """
+        API method that allows authorized vendor to mark many of the notifications addressed to
+        the vendor, read by default. Notifications the vendor sent to customers are theirs to mark.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'vendor')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return updateNotificationStatus(request.data, addressedNotifications('vendor', userPayload['user_id']))
+
+
+# auth vendor count unread notifications
+
+
+class VendorNotificationUnreadCountAPIView(APIView):
+    """
+    API endpoint that allows authorized vendor to count unread notifications.
+    """
+
+    def get(self, request):
+        """
+        API method that allows authorized vendor to count the unread notifications addressed to
+        the vendor.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'vendor')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return countUnreadNotifications(addressedNotifications('vendor', userPayload['user_id']))
+
+
+# auth vendor notify every customer with an open order
+
+
+class VendorNotificationBroadcastAPIView(APIView):
+    """
+    API endpoint that allows authorized vendor to notify every customer with an open order.
+    """
+
+    def post(self, request):
+        """
+        API method that allows authorized vendor to send one message to every customer with an
+        open order, optionally only to those who ordered a menu.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'vendor')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return broadcastNotification(userPayload['user_id'], request.data)
 
 
 #########################################################################################
@@ -1097,13 +1907,20 @@ class AuthCustomerOrderAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        sparse = SparseFields(request, OrderSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
         try:
             order = Order.objects.filter(customerId=userPayload['user_id'])
         except Order.DoesNotExist:
             return Response({'message': 'You have not made any order recently'}, status=status.HTTP_204_NO_CONTENT)
 
-        orderSerializer = OrderSerializer(order, many=True)
-        return Response(orderSerializer.data)
+        return Response(customerOrderCache.get(userPayload['user_id'], None, sparse.fields,
+                                               lambda: orderValues.many(order, sparse.fields)))
 
     def post(self, request):
         """
@@ -1154,21 +1971,28 @@ class AuthCustomerOrderAPIView(APIView):
         except:
             pass
 
-        requestData['orderStatusId'] = orderStatusId
+        requestData['orderStatusId'] = orderStatusId.defaultForeignKey
 
-        # check that menu exists
+        # check that menu exists, prices come from the current menus of an active vendor
+
+        try:
+            prices = priceIndex.prices(int(requestData['vendorId']))
+        except (TypeError, ValueError):
+            prices = None
 
         amountDue = 0
+        quantities = Counter()
+        unitPrices = {}
 
         for menuId in requestData['itemsOrdered']:
             try:
-                menu = Menu.objects.get(
-                    vendorId=requestData['vendorId'], id=menuId)
-            except Menu.DoesNotExist:
+                price = prices[int(menuId)]
+            except (TypeError, ValueError, KeyError):
                 return Response({'message': 'The selected menu ({}) is not available for order'.format(menuId)}, status.HTTP_404_NOT_FOUND)
 
-            menuSerializer = MenuSerializer(menu)
-            amountDue += menuSerializer.data['price']
+            amountDue += price
+            quantities[int(menuId)] += 1
+            unitPrices[int(menuId)] = price
 
         requestData['amountDue'] = amountDue
         requestData['amountOutstanding'] = amountDue
@@ -1179,25 +2003,59 @@ class AuthCustomerOrderAPIView(APIView):
 
             try:
                 requestData['preOrderDateTime'] = datetime.strptime(
-                    requestData['preOrderDateTime'], '%Y-%m-%dT%H:%M:%S.%fZ').astimezone(tz=pytz.utc)
+                    requestData['preOrderDateTime'], '%Y-%m-%dT%H:%M:%S.%fZ').astimezone(tz=timezone.utc)
             except:
                 return Response({'message': 'Invalid date/time format => yyyy-mm-ddThh:mm:ss.ffffffZ'}, status.HTTP_400_BAD_REQUEST)
 
-            currentDateTime = datetime.utcnow().astimezone(tz=pytz.utc)
+            currentDateTime = datetime.utcnow().astimezone(tz=timezone.utc)
 
             if (requestData['preOrderDateTime'] - currentDateTime).seconds < 18000 or (requestData['preOrderDateTime'] - currentDateTime).days > 3:
                 return Response({'message': 'Unacceptable pre-order. Pre-order is valid between 5 hours and 3 days after the order is placed'}, status.HTTP_400_BAD_REQUEST)
 
-        # Create the food order
+        # Create the food order with its items
 
         orderSerializer = OrderSerializer(data=requestData)
 
         if orderSerializer.is_valid():
-            orderSerializer.save()
+            with transaction.atomic():
+                order = orderSerializer.save()
+                OrderItem.objects.bulk_create([
+                    OrderItem(orderId=order, menuId_id=menuId,
+                              quantity=quantity, unitPrice=unitPrices[menuId])
+                    for menuId, quantity in quantities.items()
+                ])
+                customerOrderCache.invalidate(userPayload['user_id'])
             return Response(orderSerializer.data, status=status.HTTP_201_CREATED)
         return Response(orderSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# auth customer view archived orders
+
+
+class AuthCustomerOrderArchiveAPIView(APIView):
+    """
+    API endpoint that allows authorized customer view his archived food orders.
+    """
+
+    def get(self, request):
+        """
+        API method that allows authorized customer to page through his completed and paid orders
+        that were moved to the archive.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'customer')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return getArchivedOrders(request, OrderArchive.objects.filter(customerId=userPayload['user_id']))
+
+
 # auth customer view an order, delete (cancel) an order
 
 
@@ -1221,14 +2079,26 @@ class AuthCustomerOrderDetailAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        sparse = SparseFields(request, OrderSerializer)
         try:
-            order = Order.objects.get(
-                customerId=userPayload['user_id'], id=order_id)
-        except Order.DoesNotExist:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        def loadOrder():
+            try:
+                order = Order.objects.only(*sparse.fields).get(
+                    customerId=userPayload['user_id'], id=order_id)
+            except Order.DoesNotExist:
+                return None
+            return dict(OrderSerializer(order, fields=sparse.fields).data)
+
+        order = customerOrderCache.get(userPayload['user_id'], order_id, sparse.fields, loadOrder)
+        if order is None:
             return Response({'message': 'Order not found for user'}, status=status.HTTP_404_NOT_FOUND)
 
-        orderSerializer = OrderSerializer(order)
-        return Response(orderSerializer.data)
+        return Response(order)
 
     def delete(self, request, order_id):
         """
@@ -1263,6 +2133,7 @@ class AuthCustomerOrderDetailAPIView(APIView):
         # Cancel the food order
 
         order.delete()
+        customerOrderCache.invalidate(userPayload['user_id'])
         return Response({'message': 'Successfully deleted'}, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -1318,6 +2189,7 @@ class AuthCustomerOrderPaymentAPIView(APIView):
 
         if orderSerializer.is_valid():
             orderSerializer.save()
+            customerOrderCache.invalidate(userPayload['user_id'])
             return Response(orderSerializer.data)
         return Response(orderSerializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -1345,16 +2217,21 @@ class CustomerNotificationAPIView(APIView):
             pass
         userPayload = userAuth.userPayload
 
+        sparse = SparseFields(request, NotificationSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
         # Get notifications for the customer
 
         try:
-            notifications = Notification.objects.filter(
-                subjectUser=userPayload['user_id'])
+            notifications = addressedNotifications('customer', userPayload['user_id'])
         except Notification.DoesNotExist:
             return Response({'message': 'No notifications to show'}, status=status.HTTP_400_BAD_REQUEST)
 
-        notificationSerializer = NotificationSerializer(
-            notifications, many=True)
+        notificationData = notificationValues.many(notifications, sparse.fields)
 
         # Get message statuses
 
@@ -1370,11 +2247,11 @@ class CustomerNotificationAPIView(APIView):
         for e in messageStatusSerializer.data:
             messageStatus[e['id']] = e['name']
 
-        for e in notificationSerializer.data:
-            if e['messageStatusId'] in messageStatus.keys():
+        for e in notificationData:
+            if e.get('messageStatusId') in messageStatus.keys():
                 e['messageStatus'] = messageStatus[e['messageStatusId']]
                 e.pop('messageStatusId')
-        return Response(notificationSerializer.data)
+        return Response(notificationData)
 
 
 # auth customer view notifications
@@ -1401,8 +2278,8 @@ class CustomerNotificationDetailAPIView(APIView):
         userPayload = userAuth.userPayload
 
         try:
-            notification = Notification.objects.get(
-                subjectUser=userPayload['user_id'], id=notification_id)
+            notification = addressedNotifications('customer',
+                userPayload['user_id']).get(id=notification_id)
         except Notification.DoesNotExist:
             return Response({'message': 'No notification to show'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -1422,6 +2299,238 @@ class CustomerNotificationDetailAPIView(APIView):
         return Response(response)
 
 
+# auth customer update notification statuses
+
+
+class CustomerNotificationStatusAPIView(APIView):
+    """
+    API endpoint that allows authorized customer to change the status of many notifications at once.
+    """
+
+    def patch(self, request):
+        """
+        API method that allows authorized customer to mark many notifications, read by default.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'customer')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return updateNotificationStatus(request.data, addressedNotifications('customer', userPayload['user_id']))
+
+
+# auth customer count unread notifications
+
+
+class CustomerNotificationUnreadCountAPIView(APIView):
+    """
+    API endpoint that allows authorized customer to count unread notifications.
+    """
+
+    def get(self, request):
+        """
+        API method that allows authorized customer to count unread notifications.
+        """
+
+        # Authenticate/Authorize user
+
+        userAuth = UserAuthProcess(request, 'customer')
+        try:
+            if userAuth.error:
+                return userAuth.errorResponse()
+        except:
+            pass
+        userPayload = userAuth.userPayload
+
+        return countUnreadNotifications(addressedNotifications('customer', userPayload['user_id']))
+
+
+#########################################################################################
+# VIEWS FOR ADMINS
+#########################################################################################
+
+
+# admin revoke user tokens
+
+
+class AdminRevokeTokenAPIView(APIView):
+    """
+    API endpoint that allows an admin to revoke user tokens.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        """
+        API method that revokes the given token ids for as long as the tokens could be valid.
+        """
+
+        jtis = request.data.get('jti') if isinstance(request.data, dict) else None
+        if isinstance(jtis, str):
+            jtis = [jtis]
+        if not isinstance(jtis, list) or not jtis or not all(isinstance(jti, str) and 0 < len(jti) <= 64 for jti in jtis):
+            return Response({'message': 'A token id or a list of token ids is required in jti'}, status=status.HTTP_400_BAD_REQUEST)
+
+        expiresAt = datetime.now(timezone.utc) + api_settings.JWT_EXPIRATION_DELTA
+        for jti in jtis:
+            revocationList.revoke(jti, expiresAt)
+        return Response({'message': 'Successfully revoked', 'jti': jtis})
+
+
+# admin bulk sign up vendors or customers
+
+
+class AdminBulkAccountAPIView(APIView):
+    """
+    API endpoint that allows an admin to sign up many vendors or customers at once.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, user_type):
+        """
+        API method that validates a list of vendor or customer records and creates all of them,
+        or none of them with the errors of each invalid record. Passwords are hashed in the
+        request, so larger lists go through `manage.py provisionaccounts`.
+        """
+
+        if user_type not in BulkAccountProvisioning.profileModels.keys():
+            return Response({'message': 'Only vendors and customers can be provisioned'}, status=status.HTTP_404_NOT_FOUND)
+
+        if isinstance(request.data, list) and len(request.data) > settings.PROVISIONING_API_LIMIT:
+            return Response({'message': 'At most {} records can be sent at once, use manage.py provisionaccounts for more'.format(
+                settings.PROVISIONING_API_LIMIT)}, status=status.HTTP_400_BAD_REQUEST)
+
+        provisioning = BulkAccountProvisioning(user_type, request.data)
+
+        if provisioning.errors:
+            return Response({'message': 'No account was created. Fix the invalid records and try again',
+                             'errors': provisioning.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        profiles = provisioning.save()
+        if profiles is None:
+            return Response({'message': 'No account was created. Some records were signed up meanwhile',
+                             'errors': provisioning.errors}, status=status.HTTP_409_CONFLICT)
+
+        return Response(profiles, status=status.HTTP_201_CREATED)
+
+
+# admin delete a vendor or customer account
+
+
+class AdminAccountDeletionAPIView(APIView):
+    """
+    API endpoint that allows an admin to delete a vendor or customer account and follow the deletion.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, user_type, profile_id):
+        """
+        API method that shows the progress of an account deletion.
+        """
+
+        try:
+            deletion = AccountDeletion.objects.get(userType=user_type, profileId=profile_id)
+        except AccountDeletion.DoesNotExist:
+            return Response({'message': 'No deletion was requested for this account'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(AccountDeletionSerializer(deletion).data)
+
+    def delete(self, request, user_type, profile_id):
+        """
+        API method that deactivates an account at once. Its data is deleted in batches by
+        `manage.py processaccountdeletions`.
+        """
+
+        if user_type not in BulkAccountProvisioning.profileModels.keys():
+            return Response({'message': 'Only vendors and customers can be deleted'}, status=status.HTTP_404_NOT_FOUND)
+
+        if not BulkAccountProvisioning.profileModels[user_type].objects.filter(id=profile_id).exists():
+            return Response({'message': 'Account not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        deletion = scheduleAccountDeletion(user_type, profile_id)
+        return Response(AccountDeletionSerializer(deletion).data, status=status.HTTP_202_ACCEPTED)
+
+
+# admin worker memory snapshots
+
+
+class AdminMemoryAPIView(APIView):
+    """
+    API endpoint that allows an admin to trace the memory allocations of the worker serving the
+    request. Each worker traces on its own; responses carry the pid of the worker.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        API method that shows the allocation sites of the worker that grew the most since its
+        baseline, by `filename` or by `lineno` (the default) in `groupBy=`.
+        """
+
+        groupBy = request.query_params.get('groupBy', 'lineno')
+        if groupBy not in ('lineno', 'filename'):
+            return Response({'message': 'groupBy must be lineno or filename'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = int(request.query_params.get('limit', settings.MEMORY_REPORT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= settings.MEMORY_REPORT_MAX_LIMIT:
+            return Response({'message': 'limit must be between 1 and {}'.format(settings.MEMORY_REPORT_MAX_LIMIT)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        report = memoryTracker.report(limit, groupBy)
+        if report is None:
+            return Response({'message': 'Memory is not traced in this worker, POST to start',
+                             **memoryTracker.status()}, status=status.HTTP_409_CONFLICT)
+        return Response(report)
+
+    def post(self, request):
+        """
+        API method that starts tracing the worker's allocations and takes a new baseline.
+        """
+
+        memoryTracker.start()
+        return Response(memoryTracker.status(), status=status.HTTP_201_CREATED)
+
+    def delete(self, request):
+        """
+        API method that stops tracing the worker's allocations and drops the baseline.
+        """
+
+        memoryTracker.stop()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# admin customer order cache metrics
+
+
+class AdminOrderCacheAPIView(APIView):
+    """
+    API endpoint that allows an admin to view the customer order cache metrics of the worker
+    serving the request.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        API method that shows the hits, misses, hit rate and invalidations of the worker's
+        customer order cache.
+        """
+
+        return Response(customerOrderCache.stats())
+
+
 #########################################################################################
 # OTHER USEFUL VIEWS
 #########################################################################################
@@ -1437,12 +2546,64 @@ class MenuAPIView(APIView):
 
     def get(self, request):
         """
-        Function that gets all food menu.
+        Function that gets all food menu of vendors not scheduled for deletion.
         """
 
-        menu = Menu.objects.all()
-        menuSerializer = MenuSerializer(menu, many=True)
-        return Response(menuSerializer.data)
+        sparse = SparseFields(request, MenuSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        menu = Menu.objects.filter(vendorId__isActive=True)
+        return Response(menuValues.many(menu, sparse.fields))
+
+
+# get-menu-changes
+
+
+class MenuChangesAPIView(APIView):
+    """
+    API endpoint that allows the food menus changed since a previous sync to be viewed.
+    """
+
+    def get(self, request):
+        """
+        Function that gets the menus written and the ids of the menus deleted since the `since`
+        token of a previous sync, with the token for the next one. Without `since` every menu is
+        returned. A menu may come back again in the next sync, but a change is never missed.
+        Menus of vendors scheduled for deletion are left out and show up as deleted.
+        """
+
+        sparse = SparseFields(request, MenuSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        since = request.query_params.get('since', '0')
+        if not since.isdigit():
+            return Response({'message': 'since must be a token from a previous sync'}, status=status.HTTP_400_BAD_REQUEST)
+        since = int(since)
+
+        # Transactions still running may commit menus older than what is read now, so the next
+        # sync starts from the oldest of them
+        database = router.db_for_read(Menu)
+        with connections[database].cursor() as cursor:
+            cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+            nextSince = cursor.fetchone()[0]
+
+        menus = menuValues.many(Menu.objects.using(database).filter(
+            changeSequence__gte=since, vendorId__isActive=True), sparse.fields)
+
+        deleted = []
+        if since > 0:
+            deleted = list(MenuTombstone.objects.using(database).filter(
+                changeSequence__gte=since).values_list('menuId', flat=True).distinct())
+
+        return Response({'menus': menus, 'deleted': deleted, 'since': str(nextSince)})
 
 
 # get-all-menu-from-a-vendor
@@ -1455,16 +2616,22 @@ class VendorMenuAPIView(APIView):
 
     def get(self, request, vendor_id):
         """
-        Function that gets all menu by vendor id.
+        Function that gets all menu by vendor id, none if the vendor is scheduled for deletion.
         """
 
+        sparse = SparseFields(request, MenuSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
         try:
-            menu = Menu.objects.filter(vendorId=vendor_id)
+            menu = Menu.objects.filter(vendorId=vendor_id, vendorId__isActive=True)
         except Menu.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        menuSerializer = MenuSerializer(menu, many=True)
-        return Response(menuSerializer.data)
+        return Response(menuValues.many(menu, sparse.fields))
 
 
 # get-a-menu
@@ -1480,7 +2647,14 @@ class MenuDetailAPIView(APIView):
         Function that gets menu by id.
         """
 
-        return getDataById(Menu, menu_id, MenuSerializer)
+        sparse = SparseFields(request, MenuSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        return getDataById(Menu, menu_id, MenuSerializer, sparse.fields)
 
 
 # get-a-vendor
@@ -1496,4 +2670,11 @@ class VendorDetailAPIView(APIView):
         API method that gets a database row by id.
         """
 
-        return getDataById(Vendor, vendor_id, VendorSerializer)
+        sparse = SparseFields(request, VendorSerializer)
+        try:
+            if sparse.error:
+                return sparse.errorResponse()
+        except:
+            pass
+
+        return getDataById(Vendor, vendor_id, VendorSerializer, sparse.fields)
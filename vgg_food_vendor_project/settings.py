@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.0/ref/settings/
 from dotenv import load_dotenv
 import os
 import datetime
+import json
 from os import getenv
 import dj_database_url
 load_dotenv()
@@ -49,10 +50,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'vgg_food_vendor_project.food_vendor_app.middleware.ProfilingMiddleware',
+    'vgg_food_vendor_project.food_vendor_app.middleware.SlowRequestMiddleware',
+    'vgg_food_vendor_project.food_vendor_app.middleware.WorkerMemoryLimitMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'vgg_food_vendor_project.food_vendor_app.middleware.ReplicaRoutingMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -95,6 +100,42 @@ DATABASES = {
 }
 DATABASES['default'] = dj_database_url.config(default=getenv('DATABASE_URL'))
 
+# Read replicas, as a comma separated list of database URLs
+
+DATABASE_REPLICAS = []
+for i, replicaUrl in enumerate(filter(None, getenv('DATABASE_REPLICA_URLS', '').split(','))):
+    replicaAlias = 'replica_{}'.format(i + 1)
+    DATABASES[replicaAlias] = dj_database_url.parse(replicaUrl.strip())
+    DATABASES[replicaAlias].setdefault('OPTIONS', {})['connect_timeout'] = 3
+    DATABASES[replicaAlias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(replicaAlias)
+
+DATABASE_ROUTERS = [
+    'vgg_food_vendor_project.food_vendor_app.routers.ReadReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a write
+REPLICA_STICKY_SECONDS = int(getenv('REPLICA_STICKY_SECONDS', 10))
+REPLICA_HEALTH_CHECK_INTERVAL = int(getenv('REPLICA_HEALTH_CHECK_INTERVAL', 30))
+REPLICA_MAX_LAG_SECONDS = int(getenv('REPLICA_MAX_LAG_SECONDS', 30))
+
+
+# Caches
+# Every dyno must see the order cache and the invalidations made by the others, and versions
+# are moved on with an atomic incr: ORDER_CACHE_BACKEND must be a memcached backend (e.g.
+# PyLibMCCache with the MemCachier servers in ORDER_CACHE_LOCATION). The app does not start
+# with a per-process, per-host or database cache. Without ORDER_CACHE_BACKEND orders are not
+# cached at all
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'orders': {
+        'BACKEND': getenv('ORDER_CACHE_BACKEND', 'django.core.cache.backends.dummy.DummyCache'),
+        'LOCATION': getenv('ORDER_CACHE_LOCATION', ''),
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -146,8 +187,38 @@ MEDIA_URL = '/media/'
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'vgg_food_vendor_project.food_vendor_app.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'vgg_food_vendor_project.food_vendor_app.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'vgg_food_vendor_project.food_vendor_app.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'vgg_food_vendor_project.food_vendor_app.renderers.MessagePackParser',
+    ],
+    # Proxies in front of the app, each adding to X-Forwarded-For: throttles key on the address
+    # the last one saw, which clients cannot forge. The Heroku router is one
+    'NUM_PROXIES': int(getenv('NUM_PROXIES', 1)),
+    # Login and signup attempts, checked before any password is hashed
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': getenv('THROTTLE_LOGIN_IP', '30/min'),
+        'login_email': getenv('THROTTLE_LOGIN_EMAIL', '10/min'),
+        'signup_ip': getenv('THROTTLE_SIGNUP_IP', '10/min'),
+        'signup_email': getenv('THROTTLE_SIGNUP_EMAIL', '5/min'),
+    },
 }
 
+# Throttle counters of windows that are over are deleted by `manage.py purgethrottlecounters`
+
+THROTTLE_PURGE_BATCH_SIZE = 5000
+
+# Processes used to hash passwords by `manage.py provisionaccounts`, defaults to one per CPU.
+# The admin bulk API hashes in the request, so it takes at most PROVISIONING_API_LIMIT records
+PROVISIONING_HASH_WORKERS = int(getenv('PROVISIONING_HASH_WORKERS', 0)) or None
+PROVISIONING_API_LIMIT = int(getenv('PROVISIONING_API_LIMIT', 50))
+
 JWT_AUTH = {
     'JWT_VERIFY': True,
     'JWT_SECRET_KEY': 'mysecretkeyformysecrettoken',
@@ -157,3 +228,134 @@ JWT_AUTH = {
     'JWT_REFRESH_EXPIRATION_DELTA': datetime.timedelta(days=30),
     'JWT_AUTH_HEADER_PREFIX': 'Bearer'
 }
+
+
+# Worker boot import budget checked by `manage.py checkimporttime`
+
+IMPORT_TIME_BUDGET_MS = float(getenv('IMPORT_TIME_BUDGET_MS', 1000))
+IMPORT_TIME_LAZY_MODULES = ['phonenumbers', 'bcrypt']
+
+
+# Revoked token ids are kept per worker in a Bloom filter refreshed from the database
+
+TOKEN_REVOCATION_REFRESH_SECONDS = int(getenv('TOKEN_REVOCATION_REFRESH_SECONDS', 5))
+TOKEN_REVOCATION_CAPACITY = 100000
+TOKEN_REVOCATION_ERROR_RATE = 0.001
+
+# Revocations committed up to this many seconds after they were created (slow transactions,
+# clock skew between workers) still reach the other workers on their next refresh
+TOKEN_REVOCATION_OVERLAP_SECONDS = int(getenv('TOKEN_REVOCATION_OVERLAP_SECONDS', 60))
+
+
+# Names of the message statuses of read and unread notifications
+
+MESSAGE_STATUS_READ = getenv('MESSAGE_STATUS_READ', 'read')
+MESSAGE_STATUS_UNREAD = getenv('MESSAGE_STATUS_UNREAD', 'unread')
+NOTIFICATION_BULK_LIMIT = 1000
+NOTIFICATION_BROADCAST_BATCH_SIZE = 1000
+
+# Notifications older than the retention period are archived then deleted by
+# `manage.py purgenotifications`
+
+NOTIFICATION_RETENTION_DAYS = int(getenv('NOTIFICATION_RETENTION_DAYS', 90))
+NOTIFICATION_PURGE_BATCH_SIZE = 500
+NOTIFICATION_PURGE_PAUSE_SECONDS = 0.5
+NOTIFICATION_ARCHIVE_DIR = getenv(
+    'NOTIFICATION_ARCHIVE_DIR', os.path.join(BASE_DIR, 'archive', 'notifications'))
+
+# Orders are range partitioned by month; `manage.py manageorderpartitions` keeps
+# partitions created this many months ahead
+
+ORDER_PARTITION_MONTHS_AHEAD = int(getenv('ORDER_PARTITION_MONTHS_AHEAD', 3))
+
+# Completed and fully paid orders older than ORDER_ARCHIVE_AFTER_DAYS are moved to
+# OrderArchive by `manage.py archiveorders`
+
+ORDER_STATUS_COMPLETED = getenv('ORDER_STATUS_COMPLETED', 'completed')
+ORDER_ARCHIVE_AFTER_DAYS = int(getenv('ORDER_ARCHIVE_AFTER_DAYS', 90))
+ORDER_ARCHIVE_BATCH_SIZE = 500
+ORDER_ARCHIVE_PAUSE_SECONDS = 0.5
+ORDER_ARCHIVE_PAGE_SIZE = 100
+
+# Accounts scheduled for deletion are deleted in batches by
+# `manage.py processaccountdeletions`
+
+ACCOUNT_DELETION_BATCH_SIZE = 500
+ACCOUNT_DELETION_PAUSE_SECONDS = 0.2
+ACCOUNT_DELETION_POLL_SECONDS = int(getenv('ACCOUNT_DELETION_POLL_SECONDS', 10))
+
+# Upper bound of the per-process menu price index used to price orders
+
+PRICE_INDEX_MAX_BYTES = int(getenv('PRICE_INDEX_MAX_BYTES', 8 * 1024 * 1024))
+
+# Page sizes of the vendor order feed
+
+ORDER_FEED_PAGE_SIZE = 100
+ORDER_FEED_MAX_PAGE_SIZE = 500
+
+# Order status names an order may move to from each order status name, when vendors update
+# many orders at once, and the notification their customers get
+
+ORDER_STATUS_TRANSITIONS = json.loads(getenv('ORDER_STATUS_TRANSITIONS', json.dumps({
+    'pending': ['processing', 'cancelled'],
+    'processing': ['completed', 'cancelled'],
+})))
+ORDER_STATUS_BULK_LIMIT = 200
+ORDER_STATUS_NOTIFICATION_MESSAGE = getenv(
+    'ORDER_STATUS_NOTIFICATION_MESSAGE', 'Your order {orderId} is now {status}')
+
+# Orders in these statuses are not open, so broadcasts from their vendor skip their customers
+
+ORDER_STATUSES_CLOSED = [ORDER_STATUS_COMPLETED, getenv('ORDER_STATUS_CANCELLED', 'cancelled')]
+
+# Cached customer order lists and details expire after this many seconds even when no write
+# invalidates them, e.g. after a partition of old orders is dropped
+
+ORDER_CACHE_SECONDS = int(getenv('ORDER_CACHE_SECONDS', 300))
+
+# Requests profiled by ProfilingMiddleware: a sampled fraction, plus any request whose
+# X-FVA-Profile header carries PROFILING_DEBUG_TOKEN
+
+PROFILING_SAMPLE_RATE = float(getenv('PROFILING_SAMPLE_RATE', 0))
+PROFILING_DEBUG_TOKEN = getenv('PROFILING_DEBUG_TOKEN', '')
+PROFILING_SAMPLE_INTERVAL_SECONDS = 0.005
+PROFILING_DIR = getenv('PROFILING_DIR', os.path.join(BASE_DIR, 'archive', 'profiles'))
+PROFILING_KEEP_PER_ROUTE = int(getenv('PROFILING_KEEP_PER_ROUTE', 20))
+PROFILING_ADMIN_LIST_SIZE = 100
+
+# Requests slower than their route's threshold are logged as JSON lines by SlowRequestMiddleware.
+# Route thresholds are keyed by URL pattern, like {"api/auth/vendor/order/": 1000}
+
+SLOW_REQUEST_THRESHOLD_MS = float(getenv('SLOW_REQUEST_THRESHOLD_MS', 500))
+SLOW_REQUEST_ROUTE_THRESHOLDS_MS = json.loads(getenv('SLOW_REQUEST_ROUTE_THRESHOLDS_MS', '{}'))
+SLOW_REQUEST_TOP_QUERIES = int(getenv('SLOW_REQUEST_TOP_QUERIES', 5))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slowRequests': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+        'memory': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        'vgg_food_vendor_project.slowrequests': {
+            'handlers': ['slowRequests'], 'level': 'WARNING', 'propagate': False},
+        'vgg_food_vendor_project.memory': {
+            'handlers': ['memory'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# Worker memory tracing. MEMORY_SNAPSHOT_SIGNAL starts tracing a worker the first time it is
+# received and logs the allocation growth every later time; see also /api/auth/admin/memory/
+
+MEMORY_SNAPSHOT_SIGNAL = getenv('MEMORY_SNAPSHOT_SIGNAL', 'SIGUSR2')
+MEMORY_TRACE_FRAMES = int(getenv('MEMORY_TRACE_FRAMES', 1))
+MEMORY_REPORT_LIMIT = 25
+MEMORY_REPORT_MAX_LIMIT = 500
+
+# Workers whose resident memory passes this many megabytes restart after the request (0 = never)
+
+WORKER_MAX_RSS_MB = int(getenv('WORKER_MAX_RSS_MB', 0))
@@ -15,11 +15,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import include, path
+from vgg_food_vendor_project.food_vendor_app.admin import profileFile, profiles
 from vgg_food_vendor_project.food_vendor_app.views import index as landing_page
 
 urlpatterns = [
     path('', landing_page, name='index'),
     path('api/', include('vgg_food_vendor_project.food_vendor_app.urls')),
+    path('admin/profiles/', profiles, name='profiles'),
+    path('admin/profiles/<str:route>/<str:name>.<str:extension>', profileFile, name='profile-file'),
     path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework'))
 ]
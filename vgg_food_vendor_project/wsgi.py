@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vgg_food_vendor_project.settings')
 
 application = get_wsgi_application()
+
+# Workers load the application after gunicorn sets up their signals, so this handler is kept
+# (unless the application is preloaded in the master)
+from vgg_food_vendor_project.food_vendor_app.memory import installSnapshotSignalHandler  # noqa: E402
+installSnapshotSignalHandler()